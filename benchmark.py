@@ -0,0 +1,85 @@
+# Code by https://github.com/wdlord
+
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Awaitable, Callable, List
+import pokeapi
+from pokeapi_stub import PokeApiStub
+
+"""
+Benchmarks the roll, search and evolve lookups against the local pokeapi stand-in, so it runs offline.
+Unless --bundle is passed, species_data.json and evolution_index.json are ignored so every cold lookup hits the stub.
+
+python benchmark.py --iterations 200 --latency 0.05 --error-rate 0.01
+"""
+
+
+async def time_calls(call: Callable[[], Awaitable], iterations: int, cold: bool) -> List[float]:
+    """
+    Times a lookup, in milliseconds.
+
+    :param cold: Whether to empty the caches before each call.
+    """
+
+    timings = []
+
+    for _ in range(iterations):
+        if cold:
+            pokeapi.pokemon_cache.clear()
+            pokeapi.evolution_index.clear()
+
+        start = time.perf_counter()
+        await call()
+        timings.append((time.perf_counter() - start) * 1000)
+
+    return timings
+
+
+def summarize(name: str, timings: List[float]) -> str:
+    p95 = statistics.quantiles(timings, n=20)[-1] if len(timings) > 1 else timings[0]
+    return f"{name:<14} mean {statistics.mean(timings):8.2f} ms   p50 {statistics.median(timings):8.2f} ms   p95 {p95:8.2f} ms"
+
+
+async def run(args: argparse.Namespace):
+    pokeapi.load_data()
+    stub = PokeApiStub(latency=args.latency, jitter=args.jitter, error_rate=args.error_rate)
+    pokeapi.API_URL = await stub.start()
+
+    if not args.bundle:
+        pokeapi.species_data.clear()
+        pokeapi.evolution_index.clear()
+        pokeapi.roll_table[:] = list(stub.fixtures['pokemon'])
+
+    paths = {
+        'roll': lambda: pokeapi.get_pokemon(),
+        'search': lambda: pokeapi.get_pokemon('pikachu'),
+        'evolve': lambda: pokeapi.get_evolutions('kirlia'),
+    }
+
+    try:
+        for name, call in paths.items():
+            for cold in (True, False):
+                timings = await time_calls(call, args.iterations, cold)
+                print(summarize(f"{name} ({'cold' if cold else 'warm'})", timings))
+
+    finally:
+        await pokeapi.close_session()
+        await stub.stop()
+
+    print(f"\n{stub.requests} requests served by the stub.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark pokeapi lookups against a local stand-in.")
+    parser.add_argument('--iterations', type=int, default=100)
+    parser.add_argument('--latency', type=float, default=0.0)
+    parser.add_argument('--jitter', type=float, default=0.0)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--bundle', action='store_true', help="serve from species_data.json when available")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
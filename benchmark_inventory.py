@@ -0,0 +1,82 @@
+# Code by https://github.com/wdlord
+
+import argparse
+import random
+import statistics
+import time
+from typing import Callable, Dict
+import bson
+import constants
+from inventory import in_dex_order, pack, pokedex_entries, unpack
+
+"""
+Compares the name-keyed inventory map that is stored in MongoDB with the packed, dex-indexed format in inventory.py.
+For each inventory size it reports the BSON document size, the time to decode a document, and the time to build
+the Pokédex entries that /pokedex shows (make_pokemon_list).
+
+python benchmark_inventory.py --sizes 100 500 900 --iterations 200
+"""
+
+
+def make_inventory(size: int) -> Dict[str, dict]:
+    """
+    Makes a random inventory of the given number of species, in the random order they were "caught".
+    """
+
+    names = random.sample(list(constants.POKEDEX_KEY), min(size, len(constants.POKEDEX_KEY)))
+
+    return {
+        name: {'normal': random.randint(1, 20), 'shiny': int(random.random() < 0.1)}
+        for name in names
+    }
+
+
+def time_call(call: Callable, iterations: int) -> float:
+    """
+    Times a function, in microseconds (median of the iterations).
+    """
+
+    timings = []
+
+    for _ in range(iterations):
+        start = time.perf_counter()
+        call()
+        timings.append((time.perf_counter() - start) * 1_000_000)
+
+    return statistics.median(timings)
+
+
+def run(size: int, iterations: int):
+    pokemon = make_inventory(size)
+
+    map_doc = bson.encode({'_id': 2 ** 62, 'pokemon': pokemon})
+    packed_doc = bson.encode({'_id': 2 ** 62, 'inventory': bson.Binary(pack(pokemon))})
+
+    map_decode = time_call(lambda: bson.decode(map_doc), iterations)
+    packed_decode = time_call(lambda: unpack(bson.decode(packed_doc)['inventory']), iterations)
+
+    map_list = time_call(lambda: pokedex_entries(in_dex_order(bson.decode(map_doc)['pokemon'])), iterations)
+    packed_list = time_call(lambda: pokedex_entries(unpack(bson.decode(packed_doc)['inventory'])), iterations)
+
+    print(f"{size} species")
+    print(f"  {'':<8}{'document':>12}{'decode':>14}{'pokedex list':>16}")
+    print(f"  {'map':<8}{len(map_doc):>10} B{map_decode:>11.1f} us{map_list:>13.1f} us")
+    print(f"  {'packed':<8}{len(packed_doc):>10} B{packed_decode:>11.1f} us{packed_list:>13.1f} us")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark inventory storage formats.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 500, 900])
+    parser.add_argument('--iterations', type=int, default=200)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    constants.load_data()
+
+    for size in args.sizes:
+        run(size, args.iterations)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+# Code by https://github.com/wdlord
+
+import asyncio
+import json
+from typing import Dict, List, Optional, Tuple
+import pokeapi
+
+"""
+Builds species_data.json, the local bundle that get_pokemon() serves from,
+and evolution_index.json, the species -> next evolutions index that get_evolutions() serves from.
+Run this once whenever pokemon_names.json changes: python build_species_data.py
+
+The bundle maps each Pokémon name to a record from pokeapi.make_record(), for example:
+    "bulbasaur": {
+        "name": "bulbasaur", "id": 1, "species": "bulbasaur", "types": ["grass", "poison"],
+        "height": 7, "weight": 69, "sprites": {"normal": "...", "shiny": "..."}, "evolves_to": ["ivysaur"]
+    }
+"""
+
+
+# Keeps us from flooding pokeapi.co with hundreds of requests at once.
+MAX_CONCURRENT_REQUESTS = 10
+
+
+async def fetch_limited(semaphore: asyncio.Semaphore, url: str) -> Optional[dict]:
+    """
+    Fetches a URL while holding the semaphore.
+    """
+
+    async with semaphore:
+        return await pokeapi.fetch_json(url)
+
+
+async def build() -> Tuple[Dict[str, dict], Dict[str, List[str]]]:
+    """
+    Fetches every Pokémon in pokemon_names.json, along with its species and evolution chain.
+
+    :return: The bundle keyed by Pokémon name, and the evolution index keyed by species name.
+    """
+
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+
+    names = pokeapi.pokemon_names
+    results = await asyncio.gather(*[fetch_limited(semaphore, f"{pokeapi.API_URL}/pokemon/{name}/") for name in names])
+    found = [pokemon for pokemon in results if pokemon]
+
+    # Several Pokémon can share a species, and many species share a chain, so each URL is only requested once.
+    species_urls = {pokemon['species']['url'] for pokemon in found}
+    species_list = await asyncio.gather(*[fetch_limited(semaphore, url) for url in species_urls])
+
+    chain_urls = {species['evolution_chain']['url'] for species in species_list if species and species['evolution_chain']}
+    chains = await asyncio.gather(*[fetch_limited(semaphore, url) for url in chain_urls])
+
+    evolutions = {}
+    for chain in chains:
+        if chain:
+            pokeapi.flatten_chain(chain['chain'], evolutions)
+
+    bundle = {}
+    for pokemon in found:
+        evolves_to = evolutions.get(pokemon['species']['name'], [])
+        bundle[pokemon['name']] = pokeapi.make_record(pokemon, evolves_to)
+
+        # Some Pokémon are named differently to their species (ex: 'deoxys-normal'), so they are indexed by both.
+        evolutions.setdefault(pokemon['name'], evolves_to)
+
+    missing = [name for name, pokemon in zip(names, results) if not pokemon]
+    print(f"Bundled {len(bundle)} Pokémon, {len(missing)} names could not be found: {missing}")
+
+    return bundle, evolutions
+
+
+async def main():
+    pokeapi.load_data()
+
+    try:
+        bundle, evolutions = await build()
+    finally:
+        await pokeapi.close_session()
+
+    with open('species_data.json', 'w') as f:
+        json.dump(bundle, f, separators=(',', ':'))
+
+    with open('evolution_index.json', 'w') as f:
+        json.dump(evolutions, f, separators=(',', ':'))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
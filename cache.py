@@ -0,0 +1,133 @@
+# Code by https://github.com/wdlord
+
+import time
+import unittest
+from collections import OrderedDict
+from typing import Any, Hashable
+
+
+class TTLCache:
+    """
+    A size-capped, least-recently-used cache whose entries also expire after a fixed time-to-live.
+    Hit and miss counts are kept so that we can see how well the cache is working.
+    """
+
+    def __init__(self, max_size: int, ttl: float):
+        """
+        :param max_size: The maximum number of entries, the least recently used entry is evicted past this.
+        :param ttl: How many seconds an entry stays valid.
+        """
+
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+        # Maps key -> (expiry time, value), ordered from least to most recently used.
+        self._entries: OrderedDict = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        entry = self._entries.get(key)
+        return entry is not None and entry[0] > time.monotonic()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Gets a value from the cache, or the default if it is missing or expired.
+        """
+
+        entry = self._entries.get(key)
+
+        if entry is None or entry[0] <= time.monotonic():
+            self.misses += 1
+            return default
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def get_stale(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Gets a value from the cache even if it has expired.
+        Used to keep serving something while the source of the data is unavailable.
+        """
+
+        entry = self._entries.get(key)
+        return entry[1] if entry else default
+
+    def keys(self) -> list:
+        return list(self._entries)
+
+    def set(self, key: Hashable, value: Any):
+        """
+        Adds or replaces a value, evicting the least recently used entry if the cache is full.
+        """
+
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Removes a value from the cache and returns it (regardless of expiry).
+        """
+
+        entry = self._entries.pop(key, None)
+        return entry[1] if entry else default
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        """
+        Gets the current size and hit/miss counters of the cache.
+        """
+
+        total = self.hits + self.misses
+
+        return {
+            'size': len(self._entries),
+            'max_size': self.max_size,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+        }
+
+
+class TestTTLCache(unittest.TestCase):
+    """
+    This class contains unit tests for the TTLCache class.
+    """
+
+    def test_hit_and_miss(self):
+        cache = TTLCache(max_size=2, ttl=60)
+        cache.set('pikachu', 1)
+
+        self.assertEqual(cache.get('pikachu'), 1)
+        self.assertEqual(cache.get('raichu'), None)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_evicts_least_recently_used(self):
+        cache = TTLCache(max_size=2, ttl=60)
+        cache.set('pikachu', 1)
+        cache.set('raichu', 2)
+        cache.get('pikachu')
+        cache.set('pichu', 3)
+
+        self.assertIn('pikachu', cache)
+        self.assertNotIn('raichu', cache)
+        self.assertEqual(len(cache), 2)
+
+    def test_expiry(self):
+        cache = TTLCache(max_size=2, ttl=0)
+        cache.set('pikachu', 1)
+
+        self.assertEqual(cache.get('pikachu'), None)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+# Code by https://github.com/wdlord
+
+import asyncio
+import sys
+import pokeapi
+
+"""
+Reports entries in pokemon_names.json that do not resolve to a Pokémon.
+Dead entries are left out of the roll table, but should be fixed or removed from the list.
+
+python check_pokemon_names.py         checks against species_data.json
+python check_pokemon_names.py --live  checks against https://pokeapi.co
+"""
+
+
+async def find_dead_names(live: bool) -> list:
+    """
+    Gets the names that could not be resolved, in the order they appear in pokemon_names.json.
+
+    :param live: Whether to check against pokeapi.co instead of the species bundle.
+    """
+
+    if not live:
+        return [name for name in pokeapi.pokemon_names if name not in pokeapi.species_data]
+
+    semaphore = asyncio.Semaphore(10)
+
+    async def resolves(name: str) -> bool:
+        async with semaphore:
+            return await pokeapi.fetch_json(f"{pokeapi.API_URL}/pokemon/{name}/") is not None
+
+    try:
+        results = await asyncio.gather(*[resolves(name) for name in pokeapi.pokemon_names])
+    finally:
+        await pokeapi.close_session()
+
+    return [name for name, found in zip(pokeapi.pokemon_names, results) if not found]
+
+
+def main():
+    live = '--live' in sys.argv
+    pokeapi.load_data()
+
+    if not live and not pokeapi.species_data:
+        print("species_data.json is missing, run build_species_data.py or use --live.")
+        sys.exit(2)
+
+    dead_names = asyncio.run(find_dead_names(live))
+
+    print(f"Checked {len(pokeapi.pokemon_names)} names, {len(dead_names)} are dead:")
+    for name in dead_names:
+        print(f"  {name!r}")
+
+    sys.exit(1 if dead_names else 0)
+
+
+if __name__ == "__main__":
+    main()
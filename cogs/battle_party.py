@@ -82,7 +82,7 @@ class SetPartyModal(discord.ui.Modal, title="Set Your Battle Party!"):
 
             # For Pokémon that do exist...
             else:
-                pokemon_data = POKEMON_DB.get_pokemon_data(self.user, name)
+                pokemon_data = await POKEMON_DB.get_pokemon_data(self.user, name)
 
                 count = sum([1 for member in party_state if member.name == name and member.is_shiny == is_shiny])
 
@@ -112,7 +112,7 @@ class SetPartyModal(discord.ui.Modal, title="Set Your Battle Party!"):
 
         party = [{'name': party_member.name, 'is_shiny': party_member.is_shiny} for party_member in party_state]
 
-        POKEMON_DB.set_battle_party(interaction.user, party)
+        await POKEMON_DB.set_battle_party(interaction.user, party)
 
         await interaction.response.send_message("Your battle party has been updated!", ephemeral=True)
 
@@ -141,10 +141,17 @@ class BattlePartyView(discord.ui.View):
     def __init__(self, user: discord.User):
         super().__init__()
         self.user = user
-        self.battle_party = POKEMON_DB.get_battle_party(user)
+        self.battle_party = []
         self.member_index = 0
         self.message = None
 
+    async def load(self):
+        """
+        Loads the user's battle party from the database. This must be awaited before the view is sent.
+        """
+
+        self.battle_party = await POKEMON_DB.get_battle_party(self.user)
+
     def empty_embed(self):
         """
         This embed only appears when a user does not have a battle party set.
@@ -156,17 +163,24 @@ class BattlePartyView(discord.ui.View):
 
         return embed
 
-    def make_embed(self):
+    async def make_embed(self):
         """
         Creates the embed that represents a Pokémon in the battle party.
         """
 
         current_member = self.battle_party[self.member_index]
 
-        pokemon = get_pokemon(current_member['name'])
+        pokemon = await get_pokemon(current_member['name'])
+
+        # This only happens if pokeapi.co is unavailable, so we show the member without its details.
+        if not pokemon:
+            embed = discord.Embed(description='', color=0x000000, title=f"{self.user.name}'s Battle Party")
+            embed.add_field(name=current_member['name'].title(), value="*Details unavailable right now.*")
+            embed.set_footer(text=f"Party Member: {self.member_index + 1} of {len(self.battle_party)}")
+            return embed
 
         # Get the color corresponding to the first type of this Pokémon to use as the embed color.
-        first_type_name = pokemon['types'][0]['type']['name']
+        first_type_name = pokemon['types'][0]
         type_color = constants.TYPE_TO_COLOR[first_type_name]
 
         embed = discord.Embed(description='', color=type_color, title=f"{self.user.name}'s Battle Party")
@@ -196,7 +210,7 @@ class BattlePartyView(discord.ui.View):
         :return:
         """
 
-        embed = self.make_embed() if self.battle_party else self.empty_embed()
+        embed = await self.make_embed() if self.battle_party else self.empty_embed()
         await interaction.followup.send(embed=embed, view=self)
         self.message = await interaction.original_response()
 
@@ -216,7 +230,7 @@ class BattlePartyView(discord.ui.View):
         self.member_index = len(self.battle_party) - 1 if self.member_index == 0 else self.member_index - 1
 
         # Remake the embed with the next group of Pokémon, and update the message.
-        await self.message.edit(embed=self.make_embed(), view=self)
+        await self.message.edit(embed=await self.make_embed(), view=self)
 
         # We must acknowledge the interaction in some way.
         await interaction.response.defer()
@@ -237,7 +251,7 @@ class BattlePartyView(discord.ui.View):
         self.member_index = 0 if self.member_index + 1 == len(self.battle_party) else self.member_index + 1
 
         # Remake the embed with the next group of Pokémon, and update the message.
-        await self.message.edit(embed=self.make_embed(), view=self)
+        await self.message.edit(embed=await self.make_embed(), view=self)
 
         # We must acknowledge the interaction in some way.
         await interaction.response.defer()
@@ -273,7 +287,7 @@ class BattleParty(commands.Cog):
         Set your battle party of 5 Pokémon.
         """
 
-        current_battle_party = POKEMON_DB.get_battle_party(interaction.user)
+        current_battle_party = await POKEMON_DB.get_battle_party(interaction.user)
 
         # This happens when the user is not in our database.
         if current_battle_party is None:
@@ -291,6 +305,7 @@ class BattleParty(commands.Cog):
 
         await interaction.response.defer()
         view = BattlePartyView(user or interaction.user)
+        await view.load()
         await view.send(interaction)
 
 
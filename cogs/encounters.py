@@ -3,9 +3,12 @@
 import discord
 from discord.ext import commands
 import constants
-from pokeapi import get_pokemon
+from prefetch import POKEMON_POOL
 import random
+from typing import Optional
 from database import POKEMON_DB
+from sprites import SPRITE_STORE
+import io
 
 
 class EncounterView(discord.ui.View):
@@ -31,33 +34,31 @@ class EncounterView(discord.ui.View):
 
         # Add the Pokémon to the user's Pokédex if they have not already claimed it.
         else:
-            POKEMON_DB.add_pokemon(interaction.user, self.pokemon['name'], self.is_shiny)
+            await POKEMON_DB.add_pokemon(interaction.user, self.pokemon['name'], self.is_shiny)
             self.claimed_by.append(interaction.user.id)
             await interaction.response.send_message(f"{interaction.user.name} claimed **{self.pokemon['name'].title()}**!")
 
 
-async def make_file(pokemon: dict, is_shiny: bool) -> discord.File:
+async def make_file(pokemon: dict, sprite_url: str) -> Optional[discord.File]:
     """
     Makes a discord.File object for a Pokémon's image sprite.
     Externally hosted images must be downloaded to a discord.File object to be sent directly to a channel.
     (This is not necessary if the image is being sent in an embed.)
+    The sprite store only downloads each sprite once, repeat encounters are served from its cache.
     https://discordpy.readthedocs.io/en/stable/faq.html#how-do-i-upload-an-image
-    """
 
-    import io
-    import aiohttp
+    :param sprite_url: The sprite that was picked when the Pokémon was rolled (see prefetch.py).
+    """
 
-    sprite_url = constants.get_sprite(pokemon, is_shiny)
     extension = "gif" if sprite_url.endswith(".gif") else "png"
 
-    async with aiohttp.ClientSession() as session:
-        async with session.get(sprite_url) as resp:
-            if resp.status != 200:
-                print("Could not download file...")
+    data = await SPRITE_STORE.get(sprite_url)
+
+    if data is None:
+        print("Could not download file...")
+        return None
 
-            else:
-                data = io.BytesIO(await resp.read())
-                return discord.File(data, f"{pokemon['name']}.{extension}")
+    return discord.File(io.BytesIO(data), f"{pokemon['name']}.{extension}")
 
 
 async def run_encounter(channel: discord.TextChannel):
@@ -69,13 +70,18 @@ async def run_encounter(channel: discord.TextChannel):
     :return:
     """
 
-    pokemon = get_pokemon()
-    is_shiny = random.random() < constants.SHINY_CHANCE
+    rolled = await POKEMON_POOL.get()
+
+    # Encounters aren't requested by anyone, so if no Pokémon could be found we can just skip this one.
+    if not rolled:
+        return
+
+    pokemon, is_shiny = rolled.pokemon, rolled.is_shiny
 
     alert = f"A wild **{pokemon['name'].title()}** appeared!"
 
-    pokemon_sprite = await make_file(pokemon, is_shiny)
-    grass_sprite = discord.File("./grass_small.png")
+    pokemon_sprite = await make_file(pokemon, rolled.sprite_url)
+    grass_sprite = discord.File(io.BytesIO(await SPRITE_STORE.get_local("./grass_small.png")), "grass_small.png")
 
     # This view displays our Pokémon and a 'Catch' button.
     # The code that handles the button interaction is also in this class.
@@ -3,74 +3,10 @@
 import discord
 from discord.ext import commands
 import constants
-from pokeapi import get_pokemon, get_evolution_chain
+from pokeapi import get_evolutions
 import random
-from database import POKEMON_DB
-from typing import List, Optional
-
-
-class EvolutionTree:
-    """
-    Represents a species' evolution tree.
-    Some Pokémon can evolve into multiple things, this structure handles that branching potential.
-    An example of a species with branching evolutions is 'Ralts' -> 'Kirlia' -> ('Gardevoir' or 'Gallade').
-    """
-
-    def __init__(self, chain_link: dict):
-        """
-        Recursively constructs the evolution tree from a chain-link.
-        https://pokeapi.co/docs/v2#evolution-section
-
-        :param chain_link: A chain-link from the pokeapi 'evolution' endpoint.
-        """
-
-        self.name = chain_link['species']['name']
-        self.evolves_to = [EvolutionTree(next_link) for next_link in chain_link['evolves_to']]
-
-    def __repr__(self) -> str:
-        """
-        This defines how the class is printed.
-        Here we only print the name of the Pokémon represented by this link.
-        """
-
-        return f"TREE: {self.name}"
-
-
-def find_in_tree(chain_link: EvolutionTree, pokemon: str) -> Optional[EvolutionTree]:
-    """
-    Recursively finds the node representing the given Pokémon in a species evolution tree.
-
-    :param chain_link: The root of the evolution tree.
-    :param pokemon: The name of the Pokémon to find.
-    :return: The node representing the target Pokémon, or None.
-    """
-
-    # Base case: return this item if it is our target Pokémon.
-    if chain_link.name == pokemon:
-        return chain_link
-
-    # Else, recursively search through this Pokémon's evolutions.
-    for branch in chain_link.evolves_to:
-        next_link = find_in_tree(branch, pokemon)
-        if next_link:
-            return next_link
-
-    # If it was not found in those branches, return None.
-    return None
-
-
-def get_evolutions(pokemon: dict) -> List[EvolutionTree]:
-    """
-    Gets the next evolution(s) of this Pokémon as a list (empty if it can't evolve).
-    """
-
-    evolution_chain = get_evolution_chain(pokemon['name'])
-
-    evolution_tree = EvolutionTree(evolution_chain['chain'])
-
-    target_pokemon = find_in_tree(evolution_tree, pokemon['name'])
-
-    return target_pokemon.evolves_to
+from database import NO_BERRIES, POKEMON_DB
+from typing import List
 
 
 class EvolutionDropdown(discord.ui.View):
@@ -78,7 +14,7 @@ class EvolutionDropdown(discord.ui.View):
     Dropdown view that allows users to select which Pokémon to evolve to if several are available.
     """
 
-    def __init__(self, pokemon_name: str, is_shiny: bool, evolutions: List[EvolutionTree]):
+    def __init__(self, pokemon_name: str, is_shiny: bool, evolutions: List[str]):
         super().__init__()
         self.pokemon_name = pokemon_name
         self.is_shiny = is_shiny
@@ -108,7 +44,7 @@ class EvolutionDropdown(discord.ui.View):
         # This is the select menu that will appear.
         select = discord.ui.Select(
             placeholder="Choose evolution...",
-            options=[make_option(evolution.name) for evolution in self.evolutions]
+            options=[make_option(evolution) for evolution in self.evolutions]
         )
 
         # This sets the callback behavior when an option is chosen to the 'callback' func we just defined.
@@ -157,14 +93,17 @@ async def evolve_pokemon(interaction: discord.Interaction, old: str, new: str, i
     :param is_shiny: Whether we are consuming & creating a normal or shiny Pokémon.
     """
 
-    # Evolve Pokémon and consume Bluk Berry.
-    POKEMON_DB.evolve(interaction.user, old, new, is_shiny)
+    # Evolve Pokémon and consume Bluk Berry (this also updates the favorite and battle party if necessary).
+    # The checks happen in the update itself, so a berry or Pokémon used up in the meantime can't be spent twice.
+    result = await POKEMON_DB.evolve(interaction.user, old, new, is_shiny)
 
-    favorite = POKEMON_DB.get_favorite(interaction.user)
+    if result.reason == NO_BERRIES:
+        await interaction.followup.send("You don't have enough Bluk Berries.")
+        return
 
-    # Update favorite Pokémon if necessary.
-    if favorite['name'] == old and favorite['is_shiny'] == is_shiny:
-        POKEMON_DB.set_favorite(interaction.user, new, is_shiny)
+    elif not result:
+        await interaction.followup.send(f"You no longer have a {'shiny ' if is_shiny else ''}**{old.title()}** to evolve.")
+        return
 
     await interaction.followup.send(f"You evolved **{old.title()}** into **{new.title()}**!")
 
@@ -181,13 +120,13 @@ async def continue_evolve_dialog(interaction: discord.Interaction, pokemon_name,
     """
 
     # Check that this Pokémon can evolve, and what it evolves into.
-    evolutions = get_evolutions(get_pokemon(pokemon_name))
+    evolutions = await get_evolutions(pokemon_name)
 
     if not evolutions:
         await interaction.followup.send("This Pokémon cannot evolve further.")
 
     elif len(evolutions) == 1:
-        await evolve_pokemon(interaction, pokemon_name, evolutions[0].name, is_shiny)
+        await evolve_pokemon(interaction, pokemon_name, evolutions[0], is_shiny)
 
     # If this Pokémon has multiple possible evolutions, the user needs to select one.
     else:
@@ -239,7 +178,7 @@ class Evolution(commands.Cog):
                 "*You can consume this to evolve one of your Pokémon with `/evolve <pokemon>`.*"
             )
 
-            POKEMON_DB.give_berry(message.author)
+            await POKEMON_DB.give_berry(message.author)
 
             await message.reply(msg_content)
 
@@ -253,12 +192,15 @@ class Evolution(commands.Cog):
 
         pokemon_name = pokemon_name.strip().lower()
 
+        # Both fields are read in one request, evolve_pokemon() checks them again as part of the update.
+        await POKEMON_DB.preload(interaction.user, ['berries', f'pokemon.{pokemon_name}'])
+
         # The user needs at least one Bluk Berry.
-        if not POKEMON_DB.num_berries(interaction.user):
+        if not await POKEMON_DB.num_berries(interaction.user):
             await interaction.followup.send("You don't have enough Bluk Berries.")
             return
 
-        pokemon = POKEMON_DB.get_pokemon_data(interaction.user, pokemon_name)
+        pokemon = await POKEMON_DB.get_pokemon_data(interaction.user, pokemon_name)
 
         if not pokemon['normal'] and not pokemon['shiny']:
             await interaction.followup.send("You don't have that Pokémon.")
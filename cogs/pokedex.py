@@ -4,6 +4,7 @@ import discord
 from discord.ext import commands
 from database import POKEMON_DB
 from pokeapi import get_pokemon
+from inventory import pokedex_entries
 import constants
 from math import ceil
 
@@ -16,47 +17,40 @@ class PokedexPage(discord.ui.View):
     def __init__(self, user: discord.User):
         super().__init__()
         self.user = user
-        self.berry_count = POKEMON_DB.num_berries(user)
-        self.remaining_rolls = POKEMON_DB.get_remaining_rolls(user, upsert=False)
+        self.berry_count = 0
+        self.remaining_rolls = 0
         self.message: discord.Message = None
         self.pokemon_total = 0
-        self.pokemon_list = self.make_pokemon_list()
+        self.pokemon_list = []
         self.page = 0
+        self.total_pages = 0
+
+    async def load(self):
+        """
+        Loads the user's data from the database. This must be awaited before the view is sent.
+        """
+
+        # Reads everything the Pokédex shows in one round trip, the getters below are then served from the cache.
+        await POKEMON_DB.preload(self.user, ['berries', 'remaining_rolls', 'roll_period', 'pokemon', 'favorite', 'stats'])
+
+        self.berry_count = await POKEMON_DB.num_berries(self.user)
+        self.remaining_rolls = await POKEMON_DB.get_remaining_rolls(self.user)
+        self.pokemon_list = await self.make_pokemon_list()
+        self.pokemon_total = (await POKEMON_DB.get_stats(self.user))['total']
         self.total_pages = ceil(len(self.pokemon_list) / 10)
 
-    def make_pokemon_list(self):
+    async def make_pokemon_list(self):
         """
         Converts the Pokémon from the database into a list of formatted Pokédex entries.
         """
 
-        user_pokemon = POKEMON_DB.get_all_pokemon(self.user)
-
-        pokemon_list = []
+        user_pokemon = await POKEMON_DB.get_all_pokemon(self.user)
 
         # Edge case for users who are not in the database.
         if not user_pokemon:
-            return pokemon_list
-
-        for name in sorted(user_pokemon.keys(), key=lambda x: constants.POKEDEX_KEY.get(x, 9999)):
-
-            # Show normal versions of this Pokémon (if any exist).
-
-            normal_total = user_pokemon[name]['normal']
-            self.pokemon_total += normal_total
-
-            if normal_total > 0:
-                multiplier = f"x{normal_total}" if normal_total > 1 else ""
-                pokemon_list.append(f"{name.title()} {multiplier}")
+            return []
 
-            # Show shiny versions of this Pokémon (if any exist).
-
-            shiny_total = user_pokemon[name]['shiny']
-            self.pokemon_total += shiny_total
-
-            if shiny_total > 0:
-                multiplier = f"x{shiny_total}" if shiny_total > 1 else ""
-
-                pokemon_list.append(f"{name.title()}✨ {multiplier}")
+        pokemon_list, _ = pokedex_entries(user_pokemon)
 
         return pokemon_list
 
@@ -76,17 +70,17 @@ class PokedexPage(discord.ui.View):
         else:
             return self.pokemon_list[lower_bound:lower_bound + 10]
 
-    def make_embed(self):
+    async def make_embed(self):
         """
         Creates the embed that represents a page of the user's Pokédex.
         """
 
-        favorite = POKEMON_DB.get_favorite(self.user)
-        pokemon = get_pokemon(favorite['name'])
+        favorite = await POKEMON_DB.get_favorite(self.user)
+        pokemon = await get_pokemon(favorite['name']) if favorite else None
 
         # Get the color corresponding to the first type of this Pokémon to use as the embed color.
-        first_type_name = pokemon['types'][0]['type']['name']
-        type_color = constants.TYPE_TO_COLOR[first_type_name]
+        # The favorite can be missing if pokeapi.co is unavailable, in which case the embed is shown without it.
+        type_color = constants.TYPE_TO_COLOR[pokemon['types'][0]] if pokemon else 0x000000
 
         # This represents some basic information that will show up on every page.
         desc = f"\n{constants.BLUK_BERRY} x{self.berry_count} | 🎲 x{self.remaining_rolls}"
@@ -94,8 +88,9 @@ class PokedexPage(discord.ui.View):
         embed = discord.Embed(description=desc, color=type_color, title=f"{self.user.name}'s Pokédex")
 
         # Set the embed thumbnail to the user's favorite Pokémon.
-        favorite_sprite = constants.get_sprite(pokemon, favorite['is_shiny'])
-        embed.set_thumbnail(url=favorite_sprite)
+        if pokemon:
+            favorite_sprite = constants.get_sprite(pokemon, favorite['is_shiny'])
+            embed.set_thumbnail(url=favorite_sprite)
 
         # Add the appropriate slice of the Pokédex to the display.
         pokedex_slice = '\n'.join(self.get_pokedex_slice())
@@ -125,7 +120,7 @@ class PokedexPage(discord.ui.View):
         :return:
         """
 
-        embed = self.make_embed() if self.pokemon_list else self.empty_embed()
+        embed = await self.make_embed() if self.pokemon_list else self.empty_embed()
         await interaction.followup.send(embed=embed, view=self)
         self.message = await interaction.original_response()
 
@@ -147,7 +142,7 @@ class PokedexPage(discord.ui.View):
         self.page = self.page - 1 if self.page != 0 else self.total_pages - 1
 
         # Remake the embed with the next group of Pokémon, and update the message.
-        await self.message.edit(embed=self.make_embed(), view=self)
+        await self.message.edit(embed=await self.make_embed(), view=self)
 
     @discord.ui.button(label='▶', style=discord.ButtonStyle.grey)
     async def next(self, interaction: discord.Interaction, button: discord.ui.Button):
@@ -167,7 +162,23 @@ class PokedexPage(discord.ui.View):
         self.page = self.page + 1 if self.page != self.total_pages - 1 else 0
 
         # Remake the embed with the next group of Pokémon, and update the message.
-        await self.message.edit(embed=self.make_embed(), view=self)
+        await self.message.edit(embed=await self.make_embed(), view=self)
+
+
+async def set_favorite(interaction: discord.Interaction, pokemon_name: str, is_shiny: bool):
+    """
+    Sets the user's favorite Pokémon, which only happens if they still own it.
+
+    :param interaction: An active interaction we can use to send a response.
+    :param pokemon_name: The name of the Pokémon to set as the favorite.
+    :param is_shiny: Whether to set the normal or shiny variant.
+    """
+
+    if await POKEMON_DB.set_favorite(interaction.user, pokemon_name, is_shiny):
+        await interaction.followup.send(f"**{pokemon_name.title()}** has been set as your favorite Pokémon.")
+
+    else:
+        await interaction.followup.send(f"You no longer own a {'shiny ' if is_shiny else ''}**{pokemon_name.title()}**.")
 
 
 class NormalOrShiny(discord.ui.View):
@@ -186,8 +197,7 @@ class NormalOrShiny(discord.ui.View):
         """
 
         await interaction.response.defer(ephemeral=True)
-        POKEMON_DB.set_favorite(interaction.user, self.pokemon_name, False)
-        await interaction.followup.send(f"{self.pokemon_name.title()} has been set as your favorite Pokémon.")
+        await set_favorite(interaction, self.pokemon_name, False)
         self.stop()
 
     @discord.ui.button(label='Shiny', style=discord.ButtonStyle.grey)
@@ -197,8 +207,7 @@ class NormalOrShiny(discord.ui.View):
         """
 
         await interaction.response.defer(ephemeral=True)
-        POKEMON_DB.set_favorite(interaction.user, self.pokemon_name, True)
-        await interaction.followup.send(f"{self.pokemon_name.title()} has been set as your favorite Pokémon.")
+        await set_favorite(interaction, self.pokemon_name, True)
         self.stop()
 
 
@@ -236,6 +245,7 @@ class Pokedex(commands.Cog):
 
         # Uses 'user' if supplied, otherwise uses the user who called the command.
         pokedex_view = PokedexPage(user or interaction.user)
+        await pokedex_view.load()
         await pokedex_view.send(interaction)
 
     @discord.app_commands.command()
@@ -248,7 +258,7 @@ class Pokedex(commands.Cog):
 
         pokemon_name = pokemon_name.lower().strip()
 
-        pokemon_data = POKEMON_DB.get_pokemon_data(interaction.user, pokemon_name)
+        pokemon_data = await POKEMON_DB.get_pokemon_data(interaction.user, pokemon_name)
 
         if not pokemon_data['normal'] and not pokemon_data['shiny']:
             await interaction.followup.send("You do not own any of that Pokémon.")
@@ -259,8 +269,7 @@ class Pokedex(commands.Cog):
 
         # if the user only owns a normal OR shiny variant, we don't need to ask them which to set.
         elif pokemon_data['normal'] or pokemon_data['shiny']:
-            POKEMON_DB.set_favorite(interaction.user, pokemon_name, pokemon_data['shiny'] > 0)
-            await interaction.followup.send(f"**{pokemon_name.title()}** has been set as your favorite Pokémon.")
+            await set_favorite(interaction, pokemon_name, pokemon_data['shiny'] > 0)
 
 
 async def setup(bot):
@@ -1,11 +1,10 @@
 # Code by https://github.com/wdlord
 
 import discord
-from discord.ext import commands, tasks
-from pokeapi import get_pokemon
+from discord.ext import commands
+from prefetch import POKEMON_POOL
 from database import POKEMON_DB
 import constants
-import random
 import datetime
 
 
@@ -33,24 +32,23 @@ class PokemonRollCard(discord.ui.View):
         await roll_pokemon(interaction)
 
 
-def make_embed(pokemon: dict, is_shiny: bool) -> discord.Embed:
+def make_embed(pokemon: dict, is_shiny: bool, sprite_url: str) -> discord.Embed:
     """
     Creates the embed for a Pokémon roll card.
     """
 
     # Get the color corresponding to the first type of this Pokémon to use as the embed color.
-    first_type_name = pokemon['types'][0]['type']['name']
+    first_type_name = pokemon['types'][0]
     type_color = constants.TYPE_TO_COLOR[first_type_name]
 
     # Here we add custom discord emotes corresponding to the Pokémon's types to the embed.
     # We also add an extra indicator only if the Pokémon is shiny.
-    desc = f"{''.join(constants.TYPE_TO_ICON[t['type']['name']] for t in pokemon['types'])}"
+    desc = f"{''.join(constants.TYPE_TO_ICON[t] for t in pokemon['types'])}"
     desc += "\n✨Shiny✨" if is_shiny else ""
 
     embed = discord.Embed(description=desc, color=type_color, title=f"{pokemon['name'].title()}")
 
-    # Set the embed image to the Pokémon's sprite.
-    sprite_url = constants.get_sprite(pokemon, is_shiny)
+    # Set the embed image to the Pokémon's sprite, which was picked when it was rolled.
     embed.set_image(url=sprite_url)
 
     return embed
@@ -63,25 +61,32 @@ async def roll_pokemon(interaction: discord.Interaction):
     :param interaction: Either the interaction from the command, or from the 'Next' button.
     """
 
-    # Create a new random Pokémon.
-    pokemon = get_pokemon()
-    is_shiny = random.random() < constants.SHINY_CHANCE
+    # Take a random Pokémon that is ready to go.
+    rolled = await POKEMON_POOL.get()
 
-    # Add the Pokémon to the user's Pokédex.
-    POKEMON_DB.add_pokemon(interaction.user, pokemon['name'], is_shiny=is_shiny)
+    if not rolled:
+        await interaction.followup.send("Couldn't find a Pokémon, please try again.", ephemeral=True)
+        return
 
-    # Adjust the user's remaining rolls.
-    POKEMON_DB.use_roll(interaction.user)
-    remaining_rolls = POKEMON_DB.get_remaining_rolls(interaction.user)
+    pokemon, is_shiny = rolled.pokemon, rolled.is_shiny
+
+    # Use one of the user's rolls and add the Pokémon to their Pokédex.
+    remaining_rolls = await POKEMON_DB.roll(interaction.user, pokemon['name'], is_shiny)
+
+    # This happens if the user is out of rolls (or ran out since the last card was sent, ex: by clicking 'Next' twice).
+    if remaining_rolls is None:
+        POKEMON_POOL.put_back(rolled)
+        message = f"You've used all your rolls. Rolls reset in **{get_reset_time()}**."
+        await interaction.followup.send(message, ephemeral=True)    # ephemeral does not seem to work here.
 
     # If the user still has more cards to open, we recursively create another card WITH a 'Next' button.
-    if remaining_rolls > 0:
+    elif remaining_rolls > 0:
         view = PokemonRollCard(interaction.user)
-        await interaction.followup.send(embed=make_embed(pokemon, is_shiny), view=view)
+        await interaction.followup.send(embed=make_embed(pokemon, is_shiny, rolled.sprite_url), view=view)
 
     # Else we can send the card without a 'Next' button.
     else:
-        await interaction.followup.send(embed=make_embed(pokemon, is_shiny))
+        await interaction.followup.send(embed=make_embed(pokemon, is_shiny, rolled.sprite_url))
 
 
 def get_reset_time() -> str:
@@ -114,7 +119,6 @@ class RollPokemon(commands.Cog):
 
     def __init__(self, bot):
         self.bot = bot
-        self.reset_rolls.start()
 
     async def load(self):
         """
@@ -123,16 +127,6 @@ class RollPokemon(commands.Cog):
 
         await self.bot.wait_until_ready()
 
-    @tasks.loop(time=constants.RESET_TIMES)
-    async def reset_rolls(self):
-        """
-        This task resets the Pokémon rolls every day at midnight UTC.
-        """
-
-        print("Resetting all rolls...")
-        POKEMON_DB.reset_all_rolls()
-        print("Reset complete.")
-
     @commands.Cog.listener()
     async def on_ready(self):
         """
@@ -152,14 +146,8 @@ class RollPokemon(commands.Cog):
         # This may prevent the interaction breaking, we'll see.
         await interaction.response.defer()
 
-        remaining_rolls = POKEMON_DB.get_remaining_rolls(interaction.user)
-
-        if remaining_rolls > 0:
-            await roll_pokemon(interaction)
-
-        else:
-            message = f"You've used all your rolls. Rolls reset in **{get_reset_time()}**."
-            await interaction.followup.send(message, ephemeral=True)    # ephemeral does not seem to work here.
+        # Rolls are reset lazily at each of constants.RESET_TIMES, see PokemonDatabase.roll().
+        await roll_pokemon(interaction)
 
 
 async def setup(bot):
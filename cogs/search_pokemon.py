@@ -26,14 +26,14 @@ class PokemonSearchCard(discord.ui.View):
         """
 
         # Get the color corresponding to the first type of this Pokémon to use as the embed color.
-        first_type_name = self.pokemon['types'][0]['type']['name']
+        first_type_name = self.pokemon['types'][0]
         type_color = constants.TYPE_TO_COLOR[first_type_name]
 
         # Set the embed description.
         # Here we add custom discord emotes corresponding to the Pokémon's types.
         # We also show whether the user has any of this Pokémon.
         desc = (
-            f"{''.join(constants.TYPE_TO_ICON[t['type']['name']] for t in self.pokemon['types'])}"
+            f"{''.join(constants.TYPE_TO_ICON[t] for t in self.pokemon['types'])}"
             f"\nNormals Owned: {self.pokemon_data['normal']}"
             f"\nShinies Owned: {self.pokemon_data['shiny']}"
         )
@@ -103,14 +103,14 @@ class SearchPokemon(commands.Cog):
         """
 
         name = name.lower().strip()
-        pokemon = get_pokemon(name)
+        pokemon = await get_pokemon(name)
 
         if not pokemon:
             await interaction.response.send_message("We couldn't find that pokemon.", ephemeral=True)
 
         else:
             await interaction.response.defer()
-            pokemon_data = POKEMON_DB.get_pokemon_data(interaction.user, pokemon['name'])
+            pokemon_data = await POKEMON_DB.get_pokemon_data(interaction.user, pokemon['name'])
             search_card = PokemonSearchCard(pokemon, pokemon_data)
             await search_card.send_card(interaction)
 
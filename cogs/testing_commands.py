@@ -3,9 +3,10 @@
 import discord
 from discord.ext import commands
 from cogs.encounters import run_encounter
-from cogs.evolution import get_evolutions
 from database import POKEMON_DB
-from pokeapi import get_pokemon
+from pokeapi import get_pokemon, get_evolutions, pokemon_cache
+from prefetch import POKEMON_POOL
+import startup
 
 
 class TestingCommands(commands.Cog):
@@ -50,7 +51,7 @@ class TestingCommands(commands.Cog):
         Test command to reset a user's rolls.
         """
 
-        POKEMON_DB.reset_user_rolls(interaction.user)
+        await POKEMON_DB.reset_user_rolls(interaction.user)
         await interaction.response.send_message("Your rolls have been reset.", ephemeral=True)
 
     @discord.app_commands.command()
@@ -59,9 +60,29 @@ class TestingCommands(commands.Cog):
         Resets the rolls for all users.
         """
 
-        POKEMON_DB.reset_all_rolls()
+        await POKEMON_DB.reset_all_rolls()
         await interaction.response.send_message("All rolls have been reset.", ephemeral=True)
 
+    @discord.app_commands.command()
+    async def compact(self, interaction: discord.Interaction):
+        """
+        Removes empty species entries from every user's document now, instead of waiting for the scheduled run.
+        """
+
+        await interaction.response.defer(ephemeral=True)
+        report = await POKEMON_DB.compact()
+        await interaction.followup.send(f"Compaction: {report}", ephemeral=True)
+
+    @discord.app_commands.command()
+    async def archive(self, interaction: discord.Interaction):
+        """
+        Archives inactive users now, instead of waiting for the scheduled run.
+        """
+
+        await interaction.response.defer(ephemeral=True)
+        report = await POKEMON_DB.archive()
+        await interaction.followup.send(f"Archive: {report}", ephemeral=True)
+
     @discord.app_commands.command()
     async def give(self, interaction: discord.Interaction, pokemon_name: str, is_shiny: bool):
         """
@@ -69,13 +90,13 @@ class TestingCommands(commands.Cog):
         """
 
         pokemon_name = pokemon_name.lower().strip()
-        pokemon = get_pokemon(pokemon_name)
+        pokemon = await get_pokemon(pokemon_name)
 
         if not pokemon:
             await interaction.response.send_message("Could not find that Pokémon.", ephemeral=True)
 
         else:
-            POKEMON_DB.add_pokemon(interaction.user, pokemon_name, is_shiny)
+            await POKEMON_DB.add_pokemon(interaction.user, pokemon_name, is_shiny)
             await interaction.response.send_message(f"**{pokemon_name.title()}** was added to your Pokédex.", ephemeral=True)
 
     @discord.app_commands.command()
@@ -84,7 +105,7 @@ class TestingCommands(commands.Cog):
         Gives the user Bluk Berries.
         """
 
-        POKEMON_DB.give_berry(interaction.user, amount)
+        await POKEMON_DB.give_berry(interaction.user, amount)
         await interaction.response.send_message(f"You've received **{amount}** berries.", ephemeral=True)
 
     @discord.app_commands.command()
@@ -93,15 +114,30 @@ class TestingCommands(commands.Cog):
         Displays what the given Pokémon can immediately evolve into.
         """
 
-        pokemon = get_pokemon(pokemon_name)
+        evolutions = await get_evolutions(pokemon_name.lower().strip())
 
-        if not pokemon:
+        if evolutions is None:
             await interaction.response.send_message("Couldn't find that Pokémon.", ephemeral=True)
 
         else:
-            evolutions = get_evolutions(pokemon)
             await interaction.response.send_message(f"{evolutions}", ephemeral=True)
 
+    @discord.app_commands.command()
+    async def stats(self, interaction: discord.Interaction):
+        """
+        Displays the prefetch pool, Pokémon cache, database write buffer, last archive and compaction, and startup timings.
+        """
+
+        message = (
+            f"Prefetch pool: {POKEMON_POOL.stats()}\n"
+            f"Pokémon cache: {pokemon_cache.stats()}\n"
+            f"Write buffer: {POKEMON_DB.buffer.stats()}\n"
+            f"Last archive: {POKEMON_DB.last_archive}\n"
+            f"Last compaction: {POKEMON_DB.last_compaction}\n"
+            f"Startup: {startup.format_timings()}"
+        )
+        await interaction.response.send_message(message, ephemeral=True)
+
 
 async def setup(bot):
     """
@@ -2,7 +2,7 @@
 
 import discord
 from discord.ext import commands
-from database import POKEMON_DB, TradeablePokemon
+from database import NOT_OWNED, POKEMON_DB, TradeablePokemon
 
 
 class SendRequestView(discord.ui.View):
@@ -10,34 +10,37 @@ class SendRequestView(discord.ui.View):
     This class manages the view to confirm sending a trade request.
     """
 
-    def __init__(self, calling_user: discord.User, target_user: discord.User, your_pokemon: str, their_pokemon: str):
+    def __init__(
+            self,
+            calling_user: discord.User,
+            target_user: discord.User,
+            your_pokemon: str,
+            their_pokemon: str,
+            your_pokemon_data: dict,
+            their_pokemon_data: dict
+    ):
         super().__init__()
         self.calling_user = calling_user
         self.target_user = target_user
         self.your_pokemon = your_pokemon
         self.their_pokemon = their_pokemon
-        self.make_dropdown(True)
-        self.make_dropdown(False)
+        self.make_dropdown(True, your_pokemon_data)
+        self.make_dropdown(False, their_pokemon_data)
 
-    def make_dropdown(self, toggle: bool):
+    def make_dropdown(self, toggle: bool, pokemon_data: dict):
         """
         Makes the dropdowns to select Pokémon that we are trading.
+
+        :param toggle: True for the calling user's dropdown, False for the target user's.
+        :param pokemon_data: The user's saved data for the Pokémon in this dropdown.
         """
 
         async def callback(interaction: discord.Interaction):
             """Allows us to ignore the callback function on the dropdowns."""
             await interaction.response.defer()
 
-        # Changes the data depending on which user this dropdown represents.
-        if toggle:
-            user = self.calling_user
-            pokemon = self.your_pokemon
-        else:
-            user = self.target_user
-            pokemon = self.their_pokemon
-
-        # Get the user's data for given Pokémon.
-        pokemon_data = POKEMON_DB.get_pokemon_data(user, pokemon)
+        # Changes the Pokémon depending on which user this dropdown represents.
+        pokemon = self.your_pokemon if toggle else self.their_pokemon
 
         # Makes the options list.
         options = []
@@ -70,20 +73,6 @@ class SendRequestView(discord.ui.View):
         if len(selects[0].values) == 0 or len(selects[1].values) == 0:
             return
 
-        # Make sure AGAIN that caller has specified Pokémon.
-        caller_pokemon_data = POKEMON_DB.get_pokemon_data(self.calling_user, self.your_pokemon)
-        if not caller_pokemon_data['normal'] and not caller_pokemon_data['shiny']:
-            await interaction.followup.send("You do not have any of that Pokémon.")
-            self.stop()
-            return
-
-        # Make sure AGAIN that target has specified Pokémon.
-        target_pokemon_data = POKEMON_DB.get_pokemon_data(self.target_user, self.their_pokemon)
-        if not target_pokemon_data['normal'] and not target_pokemon_data['shiny']:
-            await interaction.followup.send(f"{self.target_user.name} does not have any of that Pokémon.")
-            self.stop()
-            return
-
         your_pokemon = TradeablePokemon(self.your_pokemon, selects[0].values[0] == 'shiny', self.calling_user)
         their_pokemon = TradeablePokemon(self.their_pokemon, selects[1].values[0] == 'shiny', self.target_user)
 
@@ -130,9 +119,17 @@ class ConfirmationView(discord.ui.View):
         self.stop()
         await interaction.response.defer()
 
-        POKEMON_DB.trade(self.your_pokemon, self.their_pokemon)
+        # Both users still owning their Pokémon is checked as part of the trade itself.
+        result = await POKEMON_DB.trade(self.your_pokemon, self.their_pokemon)
 
-        await interaction.followup.send(f"Trade completed!")
+        if result:
+            await interaction.followup.send(f"Trade completed!")
+
+        elif result.reason == NOT_OWNED:
+            await interaction.followup.send(f"Trade failed, {self.your_pokemon.owner.name} no longer has that Pokémon.")
+
+        else:
+            await interaction.followup.send(f"Trade failed, {self.their_pokemon.owner.name} no longer has that Pokémon.")
 
     @discord.ui.button(label='Decline', style=discord.ButtonStyle.grey)
     async def decline(self, interaction: discord.Interaction, button: discord.ui.Button):
@@ -186,19 +183,19 @@ class Trade(commands.Cog):
             return
 
         # Make sure caller has specified Pokémon.
-        caller_pokemon_data = POKEMON_DB.get_pokemon_data(interaction.user, your_pokemon)
+        caller_pokemon_data = await POKEMON_DB.get_pokemon_data(interaction.user, your_pokemon)
         if not caller_pokemon_data['normal'] and not caller_pokemon_data['shiny']:
             await interaction.followup.send("You do not have any of that Pokémon.")
             return
 
         # Make sure target has specified Pokémon.
-        target_pokemon_data = POKEMON_DB.get_pokemon_data(user, their_pokemon)
+        target_pokemon_data = await POKEMON_DB.get_pokemon_data(user, their_pokemon)
         if not target_pokemon_data['normal'] and not target_pokemon_data['shiny']:
             await interaction.followup.send(f"{user.name} does not have any of that Pokémon.")
             return
 
         message = "Select which pokemon to trade."
-        view = SendRequestView(interaction.user, user, your_pokemon, their_pokemon)
+        view = SendRequestView(interaction.user, user, your_pokemon, their_pokemon, caller_pokemon_data, target_pokemon_data)
         await interaction.followup.send(message, view=view)
 
 
@@ -2,6 +2,7 @@
 
 import datetime
 import json
+import os
 
 """This module defines project-level constants."""
 
@@ -9,24 +10,26 @@ import json
 def get_sprite(pokemon: dict, is_shiny: bool) -> str:
     # TODO: this is better suited for a utils class, but currently nothing else would go in there.
     """
-    Tries to get the animated sprite for a Pokémon if available, otherwise gets the default static sprite.
+    Gets the sprite URL for a Pokémon record (see pokeapi.make_record).
+    This is the animated sprite if available, otherwise the default static sprite.
     Extension is .gif if animated, .png if static.
     """
 
-    sprite_type = 'front_shiny' if is_shiny else 'front_default'
+    return pokemon['sprites']['shiny' if is_shiny else 'normal']
 
-    # The animated sprite can be None, so this statement will return the default sprite in that case.
-    sprite_url = (
-        pokemon['sprites']['versions']['generation-v']['black-white']['animated'][sprite_type]
-        or
-        pokemon['sprites'][sprite_type]
-    )
 
-    return sprite_url
+# Pokémon name -> National Dex number, filled by load_data() during startup (see startup.py).
+POKEDEX_KEY = {}
 
 
-with open('pokedex_key.json', 'r') as f:
-    POKEDEX_KEY = json.load(f)
+def load_data():
+    """
+    Loads the data files that constants are read from.
+    """
+
+    with open('pokedex_key.json', 'r') as f:
+        POKEDEX_KEY.clear()
+        POKEDEX_KEY.update(json.load(f))
 
 
 ENCOUNTER_CHANCE = 0.01
@@ -34,6 +37,60 @@ SHINY_CHANCE = 0.01
 BERRY_CHANCE = 0.02
 MAX_ROLLS = 3
 
+# Limits for the cache of Pokémon records fetched from pokeapi.co (TTL is in seconds).
+POKEMON_CACHE_SIZE = 1024
+POKEMON_CACHE_TTL = 24 * 60 * 60
+
+# Settings for requests to pokeapi.co (times are in seconds).
+# POKEAPI_URL can point the bot at a local stand-in instead (see pokeapi_stub.py).
+POKEAPI_URL = os.environ.get('POKEAPI_URL', "https://pokeapi.co/api/v2")
+POKEAPI_TIMEOUT = 10
+POKEAPI_MAX_CONCURRENCY = 10
+POKEAPI_RETRIES = 2
+POKEAPI_BACKOFF = 0.5
+POKEAPI_BREAKER_THRESHOLD = 5
+POKEAPI_BREAKER_RESET = 30
+
+# How many random names to try before giving up on a roll (only matters without species_data.json).
+MAX_ROLL_ATTEMPTS = 5
+
+# How many random Pokémon to keep ready for /roll and encounters, and how long to wait (seconds) after a failed prefetch.
+PREFETCH_DEPTH = 10
+PREFETCH_RETRY_DELAY = 5
+
+# Limits for the cache of user documents in database.py (TTL is in seconds).
+# This is kept short, since it is only meant to share reads within an interaction.
+USER_CACHE_SIZE = 1024
+USER_CACHE_TTL = 5
+
+# Where user documents are stored: 'mongo' (MongoDB Atlas) or 'memory' (in this process, see storage.py).
+# The memory backend saves a snapshot to STORAGE_SNAPSHOT_PATH every STORAGE_SNAPSHOT_INTERVAL seconds, if a path is set.
+STORAGE_BACKEND = os.environ.get('STORAGE_BACKEND', 'mongo')
+STORAGE_SNAPSHOT_PATH = os.environ.get('STORAGE_SNAPSHOT_PATH')
+STORAGE_SNAPSHOT_INTERVAL = 60
+
+# Berries and encounter catches are buffered and written in batches, every this many seconds or once this many are buffered.
+WRITE_BUFFER_INTERVAL = 0.5
+WRITE_BUFFER_MAX_OPS = 500
+
+# Maintenance runs every MAINTENANCE_INTERVAL seconds: users who haven't been active for ARCHIVE_AFTER_DAYS are archived,
+# then empty species entries are removed from user documents (see storage.py).
+# Each job goes through users a batch at a time, with a delay in seconds between batches.
+MAINTENANCE_INTERVAL = 24 * 60 * 60
+ARCHIVE_AFTER_DAYS = 90
+ARCHIVE_BATCH_SIZE = 100
+ARCHIVE_DELAY = 1
+COMPACTION_BATCH_SIZE = 100
+COMPACTION_DELAY = 1
+
+# Users looked up within HOT_USER_CACHE_TTL seconds are known not to be archived, so they aren't looked up in the archive.
+HOT_USER_CACHE_SIZE = 10000
+HOT_USER_CACHE_TTL = 60 * 60
+
+# How many sprite images to keep in memory, and where downloaded sprites are saved.
+SPRITE_CACHE_SIZE = 256
+SPRITE_CACHE_DIR = './.sprite_cache'
+
 BLUK_BERRY = "<:blukberry:1111793629279834270>"
 
 # These times are UTC.
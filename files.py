@@ -0,0 +1,20 @@
+# Code by https://github.com/wdlord
+
+import os
+
+
+def write_file(path: str, data: bytes):
+    """
+    Writes a file atomically: the data goes to a temporary file first, which then replaces the file,
+    so a crash never leaves a partially written file behind. Used for the sprite cache and storage snapshots.
+    """
+
+    directory = os.path.dirname(path)
+
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    with open(f"{path}.tmp", 'wb') as f:
+        f.write(data)
+
+    os.replace(f"{path}.tmp", path)
@@ -0,0 +1,197 @@
+# Code by https://github.com/wdlord
+
+"""
+A compact binary format for a user's Pokémon counts, keyed by National Dex number instead of by name.
+
+The database keeps the name-keyed map ({name: {'normal': int, 'shiny': int}}) as its only stored layout, since the
+guarded updates in storage.py need to query and $inc single species. The codec isn't used by the database,
+benchmark_inventory.py uses it to compare the two layouts. in_dex_order() and pokedex_entries() are what
+get_all_pokemon() and /pokedex use.
+
+Layout (little-endian):
+    version: uint8, count: uint16
+    count records in Pokédex order: dex number (uint16), normal count (uint32), shiny count (uint32)
+    count: uint16
+    count records for species with no dex number: name length (uint8), UTF-8 name, normal (uint32), shiny (uint32)
+Species that have no copies left are not stored.
+Fixed-width records are used so that decoding runs through struct.iter_unpack rather than a Python loop per byte.
+"""
+
+import struct
+import unittest
+from typing import Dict, List, Tuple
+import constants
+
+
+FORMAT_VERSION = 1
+
+HEADER = struct.Struct('<BH')
+COUNT = struct.Struct('<H')
+RECORD = struct.Struct('<HII')
+NAME_LENGTH = struct.Struct('<B')
+COUNTS = struct.Struct('<II')
+
+# Species without a National Dex number in pokedex_key.json are sorted after everything else.
+UNKNOWN_DEX = 9999
+
+# National Dex number -> Pokémon name, built from constants.POKEDEX_KEY once that has been loaded.
+DEX_TO_NAME: Dict[int, str] = {}
+
+
+def dex_to_name() -> Dict[int, str]:
+    if len(DEX_TO_NAME) != len(constants.POKEDEX_KEY):
+        DEX_TO_NAME.clear()
+        DEX_TO_NAME.update({number: name for name, number in constants.POKEDEX_KEY.items()})
+
+    return DEX_TO_NAME
+
+
+def dex_number(name: str) -> int:
+    return constants.POKEDEX_KEY.get(name, UNKNOWN_DEX)
+
+
+def in_dex_order(pokemon: Dict[str, dict]) -> Dict[str, dict]:
+    """
+    Gets a copy of a name-keyed inventory with the species in Pokédex order.
+    """
+
+    return {name: pokemon[name] for name in sorted(pokemon, key=lambda name: (dex_number(name), name))}
+
+
+def pack(pokemon: Dict[str, dict]) -> bytes:
+    """
+    Encodes a name-keyed inventory.
+
+    :param pokemon: The user's Pokémon, ex: {'pikachu': {'normal': 2, 'shiny': 0}}.
+    :return: The packed bytes.
+    """
+
+    known = []
+    unknown = []
+
+    for name, counts in pokemon.items():
+        normal = counts.get('normal', 0)
+        shiny = counts.get('shiny', 0)
+
+        if not normal and not shiny:
+            continue
+
+        if name in constants.POKEDEX_KEY:
+            known.append((constants.POKEDEX_KEY[name], normal, shiny))
+        else:
+            unknown.append((name, normal, shiny))
+
+    parts = [HEADER.pack(FORMAT_VERSION, len(known))]
+    parts += [RECORD.pack(*record) for record in sorted(known)]
+    parts.append(COUNT.pack(len(unknown)))
+
+    for name, normal, shiny in sorted(unknown):
+        encoded = name.encode()
+        parts += [NAME_LENGTH.pack(len(encoded)), encoded, COUNTS.pack(normal, shiny)]
+
+    return b''.join(parts)
+
+
+def unpack(data: bytes) -> Dict[str, dict]:
+    """
+    Decodes a packed inventory back into the name-keyed layout, already in Pokédex order.
+    """
+
+    version, count = HEADER.unpack_from(data)
+
+    if version != FORMAT_VERSION:
+        raise ValueError(f"Unknown inventory format version: {version}")
+
+    offset = HEADER.size
+    end = offset + count * RECORD.size
+    names = dex_to_name()
+
+    pokemon = {
+        names[number]: {'normal': normal, 'shiny': shiny}
+        for number, normal, shiny in RECORD.iter_unpack(data[offset:end])
+    }
+
+    count, = COUNT.unpack_from(data, end)
+    offset = end + COUNT.size
+
+    for _ in range(count):
+        length, = NAME_LENGTH.unpack_from(data, offset)
+        offset += NAME_LENGTH.size
+        name = data[offset:offset + length].decode()
+        offset += length
+        normal, shiny = COUNTS.unpack_from(data, offset)
+        offset += COUNTS.size
+        pokemon[name] = {'normal': normal, 'shiny': shiny}
+
+    return pokemon
+
+
+def pokedex_entries(pokemon: Dict[str, dict]) -> Tuple[List[str], int]:
+    """
+    Formats an inventory that is already in Pokédex order as Pokédex entries.
+
+    :return: The entries, and the total number of Pokémon.
+    """
+
+    entries = []
+    total = 0
+
+    for name, counts in pokemon.items():
+
+        # Show normal versions of this Pokémon (if any exist).
+
+        normal_total = counts['normal']
+        total += normal_total
+
+        if normal_total > 0:
+            multiplier = f"x{normal_total}" if normal_total > 1 else ""
+            entries.append(f"{name.title()} {multiplier}")
+
+        # Show shiny versions of this Pokémon (if any exist).
+
+        shiny_total = counts['shiny']
+        total += shiny_total
+
+        if shiny_total > 0:
+            multiplier = f"x{shiny_total}" if shiny_total > 1 else ""
+
+            entries.append(f"{name.title()}✨ {multiplier}")
+
+    return entries, total
+
+
+class TestInventory(unittest.TestCase):
+    """
+    This class contains unit tests for the inventory codec.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        constants.load_data()
+
+    def test_round_trip(self):
+        pokemon = {
+            'pikachu': {'normal': 2, 'shiny': 1},
+            'bulbasaur': {'normal': 300, 'shiny': 0},
+            'ralts': {'normal': 0, 'shiny': 0},
+            'missingno': {'normal': 1, 'shiny': 0},
+        }
+
+        unpacked = unpack(pack(pokemon))
+
+        self.assertEqual(list(unpacked), ['bulbasaur', 'pikachu', 'missingno'])
+        self.assertEqual(unpacked['bulbasaur'], {'normal': 300, 'shiny': 0})
+        self.assertEqual(unpacked['pikachu'], {'normal': 2, 'shiny': 1})
+
+    def test_pokedex_entries(self):
+        entries, total = pokedex_entries(in_dex_order({
+            'pikachu': {'normal': 1, 'shiny': 2},
+            'bulbasaur': {'normal': 3, 'shiny': 0},
+        }))
+
+        self.assertEqual(entries, ['Bulbasaur x3', 'Pikachu ', 'Pikachu✨ x2'])
+        self.assertEqual(total, 6)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,8 +3,11 @@
 import discord
 from discord.ext import commands
 import asyncio
-import os
 import creds
+import pokeapi
+import startup
+from database import POKEMON_DB
+from prefetch import POKEMON_POOL
 
 
 class Bot(commands.Bot):
@@ -22,6 +25,16 @@ class Bot(commands.Bot):
 
         super().__init__(command_prefix=['$'], intents=intents)
 
+    async def setup_hook(self):
+        """
+        This is an override of the setup_hook method.
+        Triggered once, after login but before connecting to the gateway.
+        https://discordpy.readthedocs.io/en/stable/api.html?highlight=setup_hook#discord.Client.setup_hook
+        """
+
+        # Connects to the database and warms caches, see startup.py.
+        await startup.after_login()
+
     async def on_ready(self):
         """
         This is an override of the on_ready event listener.
@@ -57,14 +70,26 @@ class Bot(commands.Bot):
         else:
             print(f'\n!ERROR!\n{exception}\n')
 
+    async def close(self):
+        """
+        This is an override of the close method.
+        Stops background work and closes the pokeapi and database connections before the bot disconnects.
+        https://discordpy.readthedocs.io/en/stable/api.html?highlight=close#discord.Client.close
+        """
+
+        await POKEMON_POOL.stop()
+        await pokeapi.close_session()
+
+        # Writes any buffered berries and catches before the connection closes.
+        await POKEMON_DB.close()
+        await super().close()
+
 
 async def main():
     bot = Bot()
 
-    # Load all the files in the /cogs folder as Cog extensions.
-    for filename in os.listdir('./cogs'):
-        if filename.endswith('.py') and filename != '__init__.py':
-            await bot.load_extension(f'cogs.{filename[:-3]}')
+    # Loads the cogs and data files, see startup.py.
+    await startup.before_login(bot)
 
     print('------')
     await bot.start(creds.TOKEN)
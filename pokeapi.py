@@ -1,115 +1,541 @@
 # Code by https://github.com/wdlord
 
-import requests
+import aiohttp
+import asyncio
 import random
 import json
+import time
 import unittest
-from typing import Optional
+from typing import Optional, List, Dict, Callable, Awaitable, Any
+from cache import TTLCache
+import constants
 
 
-# This loads a list of Pokémon names to be used with the 'random' button.
-with open('pokemon_names.json', 'r') as f:
-    pokemon_names = json.load(f)
+API_URL = constants.POKEAPI_URL
 
+# These are filled by load_data() during startup (see startup.py), so importing this module doesn't read any files.
+# They are only ever updated in place, since other modules import them directly.
 
-def get_pokemon(pokemon_name: Optional[str] = None) -> Optional[dict]:
+# The list of Pokémon names that the bundle is built from (see build_species_data.py).
+pokemon_names: List[str] = []
+
+# The local species bundle written by build_species_data.py (see that file for the record format).
+# Lookups are served from here first, and only fall back to pokeapi.co for names that aren't bundled.
+species_data: Dict[str, dict] = {}
+
+# Random rolls are drawn from this table. When the bundle is loaded it only holds names known to resolve,
+# so a roll is a single lookup. Otherwise we have to fall back to the unvalidated list of names.
+roll_table: List[str] = []
+
+# The evolution index written by build_species_data.py: species name -> names it can evolve into.
+evolution_index: Dict[str, List[str]] = {}
+
+
+def load_data():
+    """
+    Loads the Pokémon names, the species bundle and the evolution index from disk.
     """
-    Get a Pokémon by name, or a random Pokémon if no argument is passed.
 
-    :param pokemon_name: Case-insensitive Pokémon name (or None).
-    :return: Pokémon dict from https://pokeapi.co
+    with open('pokemon_names.json', 'r') as f:
+        pokemon_names[:] = json.load(f)
+
+    species_data.clear()
+    evolution_index.clear()
+
+    try:
+        with open('species_data.json', 'r') as f:
+            species_data.update(json.load(f))
+
+    except FileNotFoundError:
+        print("species_data.json not found, all lookups will use pokeapi.co.")
+
+    roll_table[:] = list(species_data) or list(pokemon_names)
+
+    try:
+        with open('evolution_index.json', 'r') as f:
+            evolution_index.update(json.load(f))
+
+    except FileNotFoundError:
+        print("evolution_index.json not found, evolutions will be looked up on pokeapi.co.")
+
+
+# Records fetched from pokeapi.co are kept here, so repeat lookups (ex: paging through a Pokédex) skip the network.
+pokemon_cache = TTLCache(constants.POKEMON_CACHE_SIZE, constants.POKEMON_CACHE_TTL)
+
+# Fetches that are currently running, keyed by what they fetch (see single_flight).
+_in_flight: Dict[str, asyncio.Task] = {}
+
+# All requests share one session so that connections to pokeapi.co are pooled and reused.
+_session: Optional[aiohttp.ClientSession] = None
+
+# Limits how many requests we have open against pokeapi.co at once.
+_limiter = asyncio.Semaphore(constants.POKEAPI_MAX_CONCURRENCY)
+
+
+class PokeApiUnavailable(Exception):
+    """
+    Raised when pokeapi.co can't be reached, either because a request failed all of its retries,
+    or because the circuit breaker is open.
     """
 
-    # Randomly select a Pokémon if no name is supplied.
-    if not pokemon_name:
-        pokemon_name = pokemon_names[random.randrange(0, len(pokemon_names))]
-        response = requests.get(f"https://pokeapi.co/api/v2/pokemon/{pokemon_name}/")
 
-        # Get a new random Pokémon if the one we used could not be found.
-        if response.status_code == 404:
-            return get_pokemon()
+class CircuitBreaker:
+    """
+    Stops us from sending requests to pokeapi.co while it is failing.
+    After enough failures in a row the breaker opens and requests fail immediately.
+    Once the reset timeout has passed, requests are let through again to test whether pokeapi.co has recovered.
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        """
+        :param failure_threshold: How many failures in a row open the breaker.
+        :param reset_timeout: How many seconds the breaker stays open before trying again.
+        """
+
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+
+    @property
+    def is_open(self) -> bool:
+        return self.opened_at is not None and time.monotonic() - self.opened_at < self.reset_timeout
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+
+    def record_failure(self):
+        self.failures += 1
+
+        # This also re-opens the breaker if a trial request fails after the reset timeout.
+        if self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+
+
+breaker = CircuitBreaker(constants.POKEAPI_BREAKER_THRESHOLD, constants.POKEAPI_BREAKER_RESET)
+
+
+def get_session() -> aiohttp.ClientSession:
+    """
+    Gets the shared HTTP session, creating it the first time it's needed.
+    This must be called from inside the running event loop.
+    """
+
+    global _session
+
+    if _session is None or _session.closed:
+        _session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=20),
+            timeout=aiohttp.ClientTimeout(total=constants.POKEAPI_TIMEOUT)
+        )
+
+    return _session
+
+
+async def close_session():
+    """
+    Closes the shared HTTP session.
+    Called when the bot shuts down.
+    """
+
+    global _session
+
+    if _session is not None and not _session.closed:
+        await _session.close()
 
-        elif response.status_code != 200:
-            print(f"pokeapi error: {response.status_code}")
+    _session = None
 
-        return response.json()
 
-    # Attempt lookup if a name was supplied.
-    else:
-        pokemon_name = pokemon_name.lower().strip()
-        response = requests.get(f"https://pokeapi.co/api/v2/pokemon/{pokemon_name}/")
+def make_record(pokemon: dict, evolves_to: Optional[List[str]] = None) -> dict:
+    """
+    Projects a full Pokémon object from https://pokeapi.co down to the fields the bot actually uses.
+    This is the same record format that is stored in species_data.json.
+
+    :param pokemon: The Pokémon object from the 'pokemon' endpoint.
+    :param evolves_to: The names of the species this Pokémon evolves into (if known).
+    :return: A compact Pokémon record.
+    """
 
-        if response.status_code != 200:
-            print(f"pokeapi error: {response.status_code}: {pokemon_name}")
-            return None
+    animated = pokemon['sprites']['versions']['generation-v']['black-white']['animated']
 
-        return response.json()
+    return {
+        'name': pokemon['name'],
+        'id': pokemon['id'],
+        'species': pokemon['species']['name'],
+        'types': [t['type']['name'] for t in pokemon['types']],
+        'height': pokemon['height'],
+        'weight': pokemon['weight'],
 
+        # The animated sprite can be None, in which case we use the default static sprite.
+        'sprites': {
+            'normal': animated['front_default'] or pokemon['sprites']['front_default'],
+            'shiny': animated['front_shiny'] or pokemon['sprites']['front_shiny'],
+        },
 
-def get_evolution_chain(pokemon_name: str) -> dict:
+        'evolves_to': evolves_to,
+    }
+
+
+async def fetch_json(url: str) -> Optional[dict]:
+    """
+    Makes a GET request to pokeapi.co using the shared session.
+    Failed requests are retried with jittered exponential backoff, and repeated failures open the circuit breaker.
+
+    :param url: The full URL to request.
+    :return: The decoded JSON response, or None if pokeapi.co says it doesn't exist.
+    :raises PokeApiUnavailable: If pokeapi.co could not be reached.
+    """
+
+    if breaker.is_open:
+        raise PokeApiUnavailable(url)
+
+    for attempt in range(constants.POKEAPI_RETRIES + 1):
+
+        # Spreads out retries so that many failed requests don't all come back at the same moment.
+        if attempt:
+            await asyncio.sleep(random.uniform(0, constants.POKEAPI_BACKOFF * 2 ** (attempt - 1)))
+
+        try:
+            async with _limiter, get_session().get(url) as response:
+
+                if response.status == 200:
+                    data = await response.json()
+                    breaker.record_success()
+                    return data
+
+                # Client errors (ex: 404 for an unknown name) won't be fixed by retrying, except rate limits.
+                if response.status < 500 and response.status != 429:
+                    breaker.record_success()
+                    return None
+
+                error = response.status
+
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            error = repr(e)
+
+        print(f"pokeapi error: {error}: {url}")
+
+    breaker.record_failure()
+    raise PokeApiUnavailable(url)
+
+
+async def single_flight(key: str, fetch: Callable[[], Awaitable[Any]]) -> Any:
+    """
+    Coalesces concurrent identical fetches.
+    The first caller for a key starts the fetch, and anyone who asks for the same key while it's running
+    waits on that same fetch instead of sending a duplicate request.
+
+    :param key: Identifies what is being fetched, ex: 'pokemon/pikachu'.
+    :param fetch: Creates the coroutine that does the fetching (only called if nothing is in flight).
+    :return: The result of the shared fetch.
+    """
+
+    task = _in_flight.get(key)
+
+    if task is None:
+        task = asyncio.ensure_future(fetch())
+        _in_flight[key] = task
+        task.add_done_callback(lambda _: _in_flight.pop(key, None))
+
+    # Shielded so that one caller being cancelled doesn't cancel the fetch for everyone else.
+    return await asyncio.shield(task)
+
+
+async def lookup_pokemon(pokemon_name: str) -> Optional[dict]:
+    """
+    Looks up a Pokémon record by its exact (normalized) name.
+    Checks the species bundle, then the record cache, and only then pokeapi.co.
+    """
+
+    if pokemon_name in species_data:
+        return species_data[pokemon_name]
+
+    record = pokemon_cache.get(pokemon_name)
+
+    if record is None:
+        try:
+            record = await single_flight(f"pokemon/{pokemon_name}", lambda: fetch_record(pokemon_name))
+
+        # While pokeapi.co is down we serve expired records rather than nothing.
+        except PokeApiUnavailable:
+            record = pokemon_cache.get_stale(pokemon_name)
+
+    return record
+
+
+async def fetch_record(pokemon_name: str) -> Optional[dict]:
+    """
+    Fetches a Pokémon from pokeapi.co and adds its record to the cache.
+    """
+
+    pokemon = await fetch_json(f"{API_URL}/pokemon/{pokemon_name}/")
+
+    if not pokemon:
+        return None
+
+    record = make_record(pokemon)
+    pokemon_cache.set(pokemon_name, record)
+
+    return record
+
+
+async def get_random_pokemon() -> Optional[dict]:
+    """
+    Gets a random Pokémon from the roll table.
+    Only retries (a bounded number of times) when running without the species bundle, where names may be dead.
+
+    :return: Pokémon record (see make_record), or None if no attempt succeeded.
+    """
+
+    for _ in range(constants.MAX_ROLL_ATTEMPTS):
+
+        # Without the bundle, the only Pokémon we can serve while pokeapi.co is down are the cached ones.
+        if breaker.is_open and not species_data and len(pokemon_cache):
+            return pokemon_cache.get_stale(random.choice(pokemon_cache.keys()))
+
+        pokemon = await lookup_pokemon(random.choice(roll_table))
+
+        if pokemon:
+            return pokemon
+
+    return None
+
+
+async def get_pokemon(pokemon_name: Optional[str] = None) -> Optional[dict]:
+    """
+    Get a Pokémon by name, or a random Pokémon if no argument is passed.
+
+    :param pokemon_name: Case-insensitive Pokémon name (or None).
+    :return: Pokémon record (see make_record), or None if it could not be found.
+    """
+
+    if not pokemon_name:
+        return await get_random_pokemon()
+
+    return await lookup_pokemon(pokemon_name.lower().strip())
+
+
+async def get_evolution_chain(pokemon_name: str) -> Optional[dict]:
     """
     Gets the evolution chain object for a Pokémon ID.
 
     :param pokemon_name: The name of a  Pokémon.
-    :return: The evolution chain object from https://pokeapi.co
+    :return: The evolution chain object from https://pokeapi.co, or None if it could not be found.
+    """
+
+    try:
+        return await single_flight(f"evolution/{pokemon_name}", lambda: fetch_evolution_chain(pokemon_name))
+
+    except PokeApiUnavailable:
+        return None
+
+
+async def fetch_evolution_chain(pokemon_name: str) -> Optional[dict]:
+    """
+    Fetches the evolution chain object for a Pokémon from pokeapi.co (see get_evolution_chain).
     """
 
     # The species ID != Pokémon ID, so we must first look up the species and get the chain URL from there.
-    response1 = requests.get(f"https://pokeapi.co/api/v2/pokemon-species/{pokemon_name}/")
+    species = await fetch_json(f"{API_URL}/pokemon-species/{pokemon_name}/")
 
-    if response1.status_code != 200:
-        print(f"pokeapi error (species): {response1.status_code}")
+    if not species or not species['evolution_chain']:
+        return None
 
     # Now we can directly query this evolution chain URL to get the correct Pokémon chain.
-    response2 = requests.get(response1.json()['evolution_chain']['url'])
+    return await fetch_json(species['evolution_chain']['url'])
 
-    if response2.status_code != 200:
-        print(f"pokeapi error (evolution_chain): {response2.status_code}")
 
-    return response2.json()
+def flatten_chain(chain_link: dict, evolutions: Dict[str, List[str]]):
+    """
+    Walks an evolution chain and records what each species in it can immediately evolve into.
+    https://pokeapi.co/docs/v2#evolution-section
 
+    :param chain_link: The root chain-link from the pokeapi 'evolution' endpoint.
+    :param evolutions: Species name -> next species names, filled in by this function.
+    """
 
-class TestInputs(unittest.TestCase):
+    stack = [chain_link]
+
+    while stack:
+        link = stack.pop()
+        evolutions[link['species']['name']] = [next_link['species']['name'] for next_link in link['evolves_to']]
+        stack.extend(link['evolves_to'])
+
+
+async def get_evolutions(pokemon_name: str) -> Optional[List[str]]:
+    """
+    Gets the next evolution(s) of a Pokémon as a list (empty if it can't evolve).
+    Some Pokémon can evolve into multiple things, ex: 'Kirlia' -> ('Gardevoir' or 'Gallade').
+
+    :param pokemon_name: The name of a Pokémon.
+    :return: The names of the Pokémon it evolves into, or None if it could not be found.
+    """
+
+    if pokemon_name in evolution_index:
+        return evolution_index[pokemon_name]
+
+    # Only Pokémon missing from evolution_index.json need to go to pokeapi.co.
+    # The whole chain is added to the index, so the rest of the family is covered too.
+    chain = await get_evolution_chain(pokemon_name)
+
+    if not chain:
+        return None
+
+    flatten_chain(chain['chain'], evolution_index)
+
+    return evolution_index.get(pokemon_name)
+
+
+class StubTestCase(unittest.IsolatedAsyncioTestCase):
+    """
+    Runs tests against a local pokeapi stand-in (see pokeapi_stub.py) instead of https://pokeapi.co.
+    The species bundle and evolution index are emptied for each test so that every lookup goes to the stub.
+    """
+
+    async def asyncSetUp(self):
+        from pokeapi_stub import PokeApiStub
+        from unittest import mock
+        import sys
+
+        self.stub = PokeApiStub()
+        base_url = await self.stub.start()
+
+        module = sys.modules[__name__]
+        self.patches = [
+            mock.patch.object(module, 'API_URL', base_url),
+            mock.patch.object(module, 'roll_table', list(self.stub.fixtures['pokemon'])),
+            mock.patch.dict(species_data, clear=True),
+            mock.patch.dict(evolution_index, clear=True),
+            mock.patch.object(constants, 'POKEAPI_BACKOFF', 0),
+            mock.patch.object(breaker, 'failure_threshold', 2),
+        ]
+
+        for patch in self.patches:
+            patch.start()
+
+        breaker.record_success()
+        pokemon_cache.clear()
+
+    async def asyncTearDown(self):
+        for patch in self.patches:
+            patch.stop()
+
+        breaker.record_success()
+        pokemon_cache.clear()
+        await close_session()
+        await self.stub.stop()
+
+
+class TestInputs(StubTestCase):
     """
     This class contains unit tests for the get_pokemon() function.
     """
 
-    def test_mixed_case(self):
-        self.assertEqual(get_pokemon('pIKACHU')['name'], 'pikachu')
+    async def test_mixed_case(self):
+        self.assertEqual((await get_pokemon('pIKACHU'))['name'], 'pikachu')
 
-    def test_whitespace(self):
-        self.assertEqual(get_pokemon('\tpikachu ')['name'], 'pikachu')
+    async def test_whitespace(self):
+        self.assertEqual((await get_pokemon('\tpikachu '))['name'], 'pikachu')
 
-    def test_invalid_name(self):
-        self.assertEqual(get_pokemon('Kuriboh'), None)
+    async def test_invalid_name(self):
+        self.assertEqual(await get_pokemon('Kuriboh'), None)
 
-    def test_random(self):
-        self.assertNotEqual(get_pokemon(), None)
+    async def test_random(self):
+        self.assertNotEqual(await get_pokemon(), None)
 
-    def test_show_expected_output(self):
+    async def test_show_expected_output(self):
 
-        pokemon = get_pokemon('pikachu')
+        pokemon = await get_pokemon('pikachu')
         print(json.dumps(pokemon, indent=4))
 
         self.assertEqual(pokemon['name'], 'pikachu')
+        self.assertEqual(pokemon['types'], ['electric'])
 
-    def test_specific(self):
+    async def test_evolution_chain(self):
 
-        name = input('type name or press enter to skip...')
+        chain = await get_evolution_chain(2)
+        print(json.dumps(chain, indent=4))
 
-        if name:
-            name = name.strip().lower()
-            pokemon = get_pokemon(name)
-            print(json.dumps(pokemon, indent=4))
+        self.assertEqual(chain['chain']['species']['name'], 'bulbasaur')
 
-            self.assertEqual(pokemon['name'], name)
+    async def test_evolutions(self):
+        self.assertEqual(await get_evolutions('kirlia'), ['gardevoir', 'gallade'])
+        self.assertEqual(await get_evolutions('gallade'), [])
 
-    def test_evolution_chain(self):
 
-        chain = get_evolution_chain(5)
-        print(json.dumps(chain, indent=4))
+class TestSingleFlight(unittest.IsolatedAsyncioTestCase):
+    """
+    This class contains unit tests for the single_flight() function.
+    """
+
+    async def test_concurrent_callers_share_one_fetch(self):
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return 'pikachu'
+
+        results = await asyncio.gather(*[single_flight('pokemon/pikachu', fetch) for _ in range(5)])
+
+        self.assertEqual(results, ['pikachu'] * 5)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(_in_flight, {})
+
+    async def test_errors_reach_every_caller(self):
+
+        async def fetch():
+            await asyncio.sleep(0.01)
+            raise ValueError()
+
+        results = await asyncio.gather(*[single_flight('pokemon/kuriboh', fetch) for _ in range(2)], return_exceptions=True)
+
+        self.assertTrue(all(isinstance(result, ValueError) for result in results))
+
+
+class TestResilience(StubTestCase):
+    """
+    This class contains unit tests for retries, the circuit breaker and degraded mode,
+    using the stub to inject errors.
+    """
+
+    def url(self, name: str) -> str:
+        return f"{self.stub.base_url}/pokemon/{name}/"
+
+    async def test_retries_until_success(self):
+        self.stub.fail_next = constants.POKEAPI_RETRIES
+
+        self.assertEqual((await fetch_json(self.url('pikachu')))['name'], 'pikachu')
+        self.assertEqual(self.stub.requests, constants.POKEAPI_RETRIES + 1)
+
+    async def test_breaker_fails_fast_once_open(self):
+        self.stub.error_rate = 1
+
+        for _ in range(breaker.failure_threshold):
+            with self.assertRaises(PokeApiUnavailable):
+                await fetch_json(self.url('pikachu'))
+
+        requests = self.stub.requests
+
+        with self.assertRaises(PokeApiUnavailable):
+            await fetch_json(self.url('pikachu'))
+
+        self.assertEqual(self.stub.requests, requests)
+
+    async def test_serves_stale_records_while_unavailable(self):
+        pokemon_cache._entries['pikachu'] = (0, {'name': 'pikachu'})
+        breaker.opened_at = time.monotonic()
+
+        self.assertEqual(await lookup_pokemon('pikachu'), {'name': 'pikachu'})
+
+    async def test_latency(self):
+        self.stub.latency = 0.05
+        start = time.monotonic()
+
+        await get_pokemon('pikachu')
 
-        self.assertNotEqual(chain, None)
+        self.assertGreaterEqual(time.monotonic() - start, 0.05)
 
 
 if __name__ == "__main__":
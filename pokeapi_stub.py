@@ -0,0 +1,250 @@
+# Code by https://github.com/wdlord
+
+import argparse
+import asyncio
+import json
+import os
+import random
+from typing import Dict, List, Optional
+from aiohttp import web
+
+"""
+A local stand-in for https://pokeapi.co that serves recorded responses, for testing and benchmarking offline.
+It serves the /pokemon/, /pokemon-species/ and /evolution-chain/ endpoints from fixtures/pokeapi,
+and can add latency and errors to every response.
+
+Run the stub:      python pokeapi_stub.py --port 8080 --latency 0.05 --error-rate 0.01
+Point the bot:     POKEAPI_URL=http://127.0.0.1:8080/api/v2 python main.py
+Record fixtures:   python pokeapi_stub.py --record pikachu eevee
+"""
+
+
+LIVE_URL = "https://pokeapi.co/api/v2"
+FIXTURES_DIR = './fixtures/pokeapi'
+ENDPOINTS = ['pokemon', 'pokemon-species', 'evolution-chain']
+
+
+def load_fixtures(fixtures_dir: str) -> Dict[str, Dict[str, dict]]:
+    """
+    Loads the recorded responses for each endpoint, indexed by both name and ID (like pokeapi.co itself).
+
+    :param fixtures_dir: The folder with one <endpoint>.json file per endpoint.
+    :return: Endpoint -> name or ID -> response.
+    """
+
+    fixtures = {}
+
+    for endpoint in ENDPOINTS:
+        try:
+            with open(os.path.join(fixtures_dir, f"{endpoint}.json"), 'r') as f:
+                recorded = json.load(f)
+
+        except FileNotFoundError:
+            recorded = {}
+
+        fixtures[endpoint] = {}
+
+        for key, response in recorded.items():
+            fixtures[endpoint][key] = response
+            fixtures[endpoint][str(response['id'])] = response
+
+    return fixtures
+
+
+class PokeApiStub:
+    """
+    The stand-in server. Latency and errors can be changed while it is running.
+    """
+
+    def __init__(self, fixtures_dir: str = FIXTURES_DIR, latency: float = 0.0, jitter: float = 0.0, error_rate: float = 0.0):
+        """
+        :param fixtures_dir: The folder that recorded responses are loaded from.
+        :param latency: Seconds added to every response.
+        :param jitter: Up to this many extra seconds are randomly added to every response.
+        :param error_rate: The fraction of requests that get a 503 response.
+        """
+
+        self.fixtures = load_fixtures(fixtures_dir)
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+
+        # The next this many requests get a 503 response, regardless of error_rate.
+        self.fail_next = 0
+
+        self.requests = 0
+        self.base_url: Optional[str] = None
+        self._runner: Optional[web.AppRunner] = None
+
+    async def handle(self, request: web.Request) -> web.Response:
+        """
+        Serves one recorded response.
+        """
+
+        self.requests += 1
+
+        delay = self.latency + random.uniform(0, self.jitter)
+        if delay:
+            await asyncio.sleep(delay)
+
+        if self.fail_next:
+            self.fail_next -= 1
+            return web.Response(status=503)
+
+        if random.random() < self.error_rate:
+            return web.Response(status=503)
+
+        response = self.fixtures.get(request.match_info['endpoint'], {}).get(request.match_info['key'].lower())
+
+        if response is None:
+            return web.Response(status=404, text="Not Found")
+
+        # Recorded responses link to each other (ex: species -> evolution chain), so those links must point back here.
+        body = json.dumps(response).replace(LIVE_URL, self.base_url)
+
+        return web.Response(text=body, content_type='application/json')
+
+    async def start(self, host: str = '127.0.0.1', port: int = 0) -> str:
+        """
+        Starts serving in the background.
+
+        :param port: The port to listen on, 0 picks a free port.
+        :return: The base URL to use in place of https://pokeapi.co/api/v2
+        """
+
+        app = web.Application()
+        app.router.add_get('/api/v2/{endpoint}/{key}/', self.handle)
+
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, host, port).start()
+
+        host, port = self._runner.addresses[0][:2]
+        self.base_url = f"http://{host}:{port}/api/v2"
+
+        return self.base_url
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+
+def trim_chain_link(chain_link: dict) -> dict:
+    return {
+        'species': chain_link['species'],
+        'evolves_to': [trim_chain_link(next_link) for next_link in chain_link['evolves_to']],
+    }
+
+
+def trim(endpoint: str, response: dict) -> dict:
+    """
+    Trims a live response down to the fields the bot reads, so the fixtures stay small.
+    """
+
+    if endpoint == 'pokemon':
+        sprites = response['sprites']
+        animated = sprites['versions']['generation-v']['black-white']['animated']
+
+        return {
+            'id': response['id'],
+            'name': response['name'],
+            'height': response['height'],
+            'weight': response['weight'],
+            'species': response['species'],
+            'types': response['types'],
+            'sprites': {
+                'front_default': sprites['front_default'],
+                'front_shiny': sprites['front_shiny'],
+                'versions': {'generation-v': {'black-white': {'animated': {
+                    'front_default': animated['front_default'],
+                    'front_shiny': animated['front_shiny'],
+                }}}},
+            },
+        }
+
+    if endpoint == 'pokemon-species':
+        return {'id': response['id'], 'name': response['name'], 'evolution_chain': response['evolution_chain']}
+
+    return {'id': response['id'], 'chain': trim_chain_link(response['chain'])}
+
+
+async def record(names: List[str], fixtures_dir: str):
+    """
+    Fetches the Pokémon, species and evolution chain for each name from pokeapi.co and adds them to the fixtures.
+    """
+
+    import pokeapi
+
+    recorded = {}
+    for endpoint in ENDPOINTS:
+        try:
+            with open(os.path.join(fixtures_dir, f"{endpoint}.json"), 'r') as f:
+                recorded[endpoint] = json.load(f)
+
+        except FileNotFoundError:
+            recorded[endpoint] = {}
+
+    try:
+        for name in names:
+            pokemon = await pokeapi.fetch_json(f"{LIVE_URL}/pokemon/{name}/")
+
+            if not pokemon:
+                print(f"Could not find {name}, skipping.")
+                continue
+
+            species = await pokeapi.fetch_json(pokemon['species']['url'])
+            chain = await pokeapi.fetch_json(species['evolution_chain']['url'])
+
+            recorded['pokemon'][pokemon['name']] = trim('pokemon', pokemon)
+            recorded['pokemon-species'][species['name']] = trim('pokemon-species', species)
+            recorded['evolution-chain'][str(chain['id'])] = trim('evolution-chain', chain)
+
+            print(f"Recorded {name}.")
+
+    finally:
+        await pokeapi.close_session()
+
+    os.makedirs(fixtures_dir, exist_ok=True)
+
+    for endpoint, responses in recorded.items():
+        with open(os.path.join(fixtures_dir, f"{endpoint}.json"), 'w') as f:
+            json.dump(responses, f, indent=2, ensure_ascii=False)
+            f.write('\n')
+
+
+async def serve(stub: PokeApiStub, host: str, port: int):
+    base_url = await stub.start(host, port)
+    print(f"Serving recorded pokeapi responses at {base_url}")
+
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await stub.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stand-in for pokeapi.co.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--fixtures', default=FIXTURES_DIR)
+    parser.add_argument('--latency', type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument('--jitter', type=float, default=0.0, help="up to this many extra random seconds per response")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="fraction of requests that get a 503")
+    parser.add_argument('--record', nargs='+', metavar='NAME', help="record these Pokémon from pokeapi.co and exit")
+    args = parser.parse_args()
+
+    if args.record:
+        asyncio.run(record(args.record, args.fixtures))
+        return
+
+    stub = PokeApiStub(args.fixtures, args.latency, args.jitter, args.error_rate)
+
+    try:
+        asyncio.run(serve(stub, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
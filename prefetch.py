@@ -0,0 +1,158 @@
+# Code by https://github.com/wdlord
+
+import asyncio
+import random
+import unittest
+from dataclasses import dataclass
+from typing import Optional
+import constants
+from pokeapi import get_pokemon
+
+
+@dataclass
+class RolledPokemon:
+    pokemon: dict
+    is_shiny: bool
+    sprite_url: str
+
+
+async def roll_random_pokemon() -> Optional[RolledPokemon]:
+    """
+    Picks a random Pokémon and decides whether it is shiny.
+    This is shared by /roll and encounters.
+    """
+
+    pokemon = await get_pokemon()
+
+    if not pokemon:
+        return None
+
+    is_shiny = random.random() < constants.SHINY_CHANCE
+
+    return RolledPokemon(pokemon, is_shiny, constants.get_sprite(pokemon, is_shiny))
+
+
+class PrefetchPool:
+    """
+    Keeps a queue of random Pokémon that have already been looked up, so /roll and encounters don't have to wait on it.
+    A background task tops the queue back up to its target depth whenever an entry is taken.
+    """
+
+    def __init__(self, target_depth: int):
+        self.target_depth = target_depth
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=target_depth)
+        self.served = 0
+        self.misses = 0
+        self.returned = 0
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        """
+        Starts the background task that fills the queue.
+        """
+
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._fill())
+
+    async def stop(self):
+        """
+        Stops the background task.
+        """
+
+        if self._task is not None:
+            self._task.cancel()
+
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+            self._task = None
+
+    async def _fill(self):
+        """
+        Keeps the queue full. Waits on put() while the queue is at its target depth.
+        """
+
+        while True:
+            try:
+                rolled = await roll_random_pokemon()
+
+            except Exception as error:
+                print(f"prefetch error: {error}")
+                rolled = None
+
+            # Back off briefly so that a failing lookup doesn't turn into a busy loop.
+            if rolled is None:
+                await asyncio.sleep(constants.PREFETCH_RETRY_DELAY)
+                continue
+
+            await self.queue.put(rolled)
+
+    async def get(self) -> Optional[RolledPokemon]:
+        """
+        Takes a ready Pokémon from the queue, or rolls one directly if the queue has run dry.
+        """
+
+        try:
+            rolled = self.queue.get_nowait()
+            self.served += 1
+            return rolled
+
+        except asyncio.QueueEmpty:
+            self.misses += 1
+            return await roll_random_pokemon()
+
+    def put_back(self, rolled: RolledPokemon):
+        """
+        Returns a Pokémon that was taken but not used (ex: the user was out of rolls), so it isn't wasted.
+        It is dropped if the queue has already been filled back up.
+        """
+
+        try:
+            self.queue.put_nowait(rolled)
+            self.returned += 1
+
+        except asyncio.QueueFull:
+            pass
+
+    def stats(self) -> dict:
+        """
+        Gets the current queue depth and how often the queue has run dry.
+        """
+
+        return {
+            'depth': self.queue.qsize(),
+            'target_depth': self.target_depth,
+            'served': self.served,
+            'misses': self.misses,
+            'returned': self.returned,
+        }
+
+
+# This instance is shared by /roll and encounters, and is started in main.py.
+POKEMON_POOL: PrefetchPool = PrefetchPool(constants.PREFETCH_DEPTH)
+
+
+class TestPrefetchPool(unittest.IsolatedAsyncioTestCase):
+    """
+    This class contains unit tests for the PrefetchPool class.
+    """
+
+    async def test_serves_prefetched_entries(self):
+        pool = PrefetchPool(2)
+        rolled = RolledPokemon({'name': 'pikachu'}, False, '')
+        pool.queue.put_nowait(rolled)
+
+        self.assertIs(await pool.get(), rolled)
+        self.assertEqual(pool.stats()['served'], 1)
+        self.assertEqual(pool.stats()['misses'], 0)
+
+        pool.put_back(rolled)
+
+        self.assertIs(await pool.get(), rolled)
+        self.assertEqual(pool.stats()['returned'], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
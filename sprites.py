@@ -0,0 +1,133 @@
+# Code by https://github.com/wdlord
+
+import aiohttp
+import asyncio
+import hashlib
+import os
+import unittest
+from typing import Dict, Optional
+import constants
+import pokeapi
+from cache import TTLCache
+from files import write_file
+
+
+class SpriteStore:
+    """
+    Caches sprite images so that each one only has to be downloaded once.
+    Recently used sprites are kept in memory, and every sprite is also saved to disk so it survives restarts.
+    Sprites are keyed by their URL, since a sprite URL always points to the same image.
+    """
+
+    def __init__(self, max_size: int, cache_dir: str):
+        """
+        :param max_size: How many sprites to keep in memory.
+        :param cache_dir: The folder that sprites are saved to.
+        """
+
+        self.memory = TTLCache(max_size, float('inf'))
+        self.cache_dir = cache_dir
+
+        # Files that ship with the bot (ex: the grass sprite) never change, so they're read once and kept.
+        self._local_files: Dict[str, bytes] = {}
+
+    def _path(self, url: str) -> str:
+        """
+        Gets the disk location for a sprite URL.
+        """
+
+        return os.path.join(self.cache_dir, hashlib.sha256(url.encode()).hexdigest())
+
+    async def get(self, url: str) -> Optional[bytes]:
+        """
+        Gets the image for a sprite URL from memory, then disk, and downloads it if neither has it.
+
+        :return: The image bytes, or None if it could not be downloaded.
+        """
+
+        data = self.memory.get(url)
+
+        if data is None:
+            data = await pokeapi.single_flight(f"sprite/{url}", lambda: self._load(url))
+
+        return data
+
+    async def _load(self, url: str) -> Optional[bytes]:
+        """
+        Loads a sprite from disk or downloads it, then adds it to the memory cache.
+        """
+
+        path = self._path(url)
+
+        try:
+            data = await asyncio.to_thread(_read_file, path)
+
+        except FileNotFoundError:
+            data = await self._download(url)
+
+            if data is None:
+                return None
+
+            await asyncio.to_thread(write_file, path, data)
+
+        self.memory.set(url, data)
+        return data
+
+    async def _download(self, url: str) -> Optional[bytes]:
+        """
+        Downloads a sprite using the shared HTTP session.
+        """
+
+        try:
+            async with pokeapi.get_session().get(url) as response:
+
+                if response.status != 200:
+                    print(f"Could not download sprite: {response.status}: {url}")
+                    return None
+
+                return await response.read()
+
+        except (aiohttp.ClientError, asyncio.TimeoutError) as error:
+            print(f"Could not download sprite: {error!r}: {url}")
+            return None
+
+    async def get_local(self, path: str) -> bytes:
+        """
+        Gets the contents of an image file that ships with the bot.
+        """
+
+        if path not in self._local_files:
+            self._local_files[path] = await asyncio.to_thread(_read_file, path)
+
+        return self._local_files[path]
+
+
+def _read_file(path: str) -> bytes:
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+# This instance is used for any sprites that the bot uploads itself (ex: encounters).
+SPRITE_STORE: SpriteStore = SpriteStore(constants.SPRITE_CACHE_SIZE, constants.SPRITE_CACHE_DIR)
+
+
+class TestSpriteStore(unittest.IsolatedAsyncioTestCase):
+    """
+    This class contains unit tests for the SpriteStore class.
+    """
+
+    async def test_disk_tier(self):
+        import tempfile
+
+        with tempfile.TemporaryDirectory() as cache_dir:
+            url = "https://example.com/pikachu.gif"
+            write_file(SpriteStore(1, cache_dir)._path(url), b'GIF89a')
+
+            store = SpriteStore(1, cache_dir)
+
+            self.assertEqual(await store.get(url), b'GIF89a')
+            self.assertIn(url, store.memory)
+
+
+if __name__ == "__main__":
+    unittest.main()
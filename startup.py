@@ -0,0 +1,105 @@
+# Code by https://github.com/wdlord
+
+import asyncio
+import os
+import time
+from typing import Awaitable, Dict, Optional
+from discord.ext import commands
+import constants
+import pokeapi
+from database import POKEMON_DB
+from prefetch import POKEMON_POOL
+from sprites import SPRITE_STORE
+
+"""
+The bot's startup phases. Nothing is loaded or connected when modules are imported, it all happens here instead.
+
+Before login:  the cogs are loaded and the data files are read, at the same time.
+After login:   the database client is created and caches are warmed, at the same time.
+               The periodic archiving and compaction of user documents is scheduled.
+               The database ping and index setup run in the background, so they don't hold up connecting to the gateway.
+"""
+
+
+# How long each phase took, in seconds.
+timings: Dict[str, float] = {}
+
+# A reference to the background database checks, so they aren't garbage collected before they finish.
+_database_task: Optional[asyncio.Task] = None
+
+
+async def timed(phase: str, awaitable: Awaitable):
+    """
+    Awaits one phase and records how long it took.
+    """
+
+    start = time.perf_counter()
+
+    try:
+        return await awaitable
+
+    finally:
+        timings[phase] = time.perf_counter() - start
+
+
+async def load_cogs(bot: commands.Bot):
+    """
+    Loads all the files in the /cogs folder as Cog extensions.
+    """
+
+    names = [filename[:-3] for filename in os.listdir('./cogs') if filename.endswith('.py') and filename != '__init__.py']
+    await asyncio.gather(*[bot.load_extension(f'cogs.{name}') for name in names])
+
+
+async def load_data():
+    """
+    Reads the data files that constants.py and pokeapi.py use.
+    """
+
+    await asyncio.gather(asyncio.to_thread(constants.load_data), asyncio.to_thread(pokeapi.load_data))
+
+
+async def warm_caches():
+    """
+    Starts filling the queue of random Pokémon used by /roll and encounters, and reads the grass sprite.
+    """
+
+    POKEMON_POOL.start()
+    await SPRITE_STORE.get_local("./grass_small.png")
+
+
+async def before_login(bot: commands.Bot):
+    await asyncio.gather(
+        timed('cogs', load_cogs(bot)),
+        timed('data files', load_data()),
+    )
+
+
+async def after_login():
+    """
+    Called in setup_hook, once the data files have been loaded.
+    """
+
+    await asyncio.gather(
+        timed('database', POKEMON_DB.connect()),
+        timed('caches', warm_caches()),
+    )
+
+    POKEMON_DB.start_maintenance()
+
+    global _database_task
+    _database_task = asyncio.create_task(check_database())
+    _database_task.add_done_callback(lambda _: print(f"Startup timings: {format_timings()}"))
+
+
+async def check_database():
+    """
+    Pings the database, then creates its indexes and fills in fields that older documents are missing.
+    """
+
+    await timed('database ping', POKEMON_DB.ping())
+    await timed('database prepare', POKEMON_DB.prepare())
+
+
+def format_timings() -> str:
+    return ", ".join(f"{phase} {seconds * 1000:.0f} ms" for phase, seconds in timings.items())